@@ -52,10 +52,10 @@ export default function ForecastPage() {
       if (selectedDimension !== "overall") {
         setFetchingUniqueValues(true);
         try {
-          const values = await fetchUniqueDimensionValues(selectedDimension);
+          const { values, total } = await fetchUniqueDimensionValues(selectedDimension);
           setUniqueDimensionValues(values);
           // Set initial filter value if only one option is available, or clear if none
-          if (values.length === 1) {
+          if (total === 1 && values.length === 1) {
             setDimensionFilterValue(values[0]);
           } else {
             setDimensionFilterValue("");
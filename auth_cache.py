@@ -0,0 +1,114 @@
+# auth_cache.py
+import base64
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+try:
+    import jwt # PyJWT; optional, without it tokens are verified remotely by Supabase Auth
+except ImportError:
+    jwt = None
+
+
+# Returned by TTLCache.get() lookups that pass it as default, to tell a cached None from a miss
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries expire after `ttl_seconds`
+    (or earlier, when put() is given an explicit expiry).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, expires_in: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if expires_in is None else min(self.ttl_seconds, expires_in)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def token_cache_key(token: str) -> str:
+    """Tokens are cached under their hash so raw bearer tokens never sit in memory longer than needed."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def local_jwt_verification_available(secret: Optional[str]) -> bool:
+    return jwt is not None and bool(secret)
+
+
+def decode_supabase_jwt(token: str, secret: str, audience: str = 'authenticated') -> Dict[str, Any]:
+    """
+    Verifies a Supabase access token locally (HS256 signature, expiry and audience)
+    and returns its claims. Raises jwt.InvalidTokenError (or a subclass such as
+    jwt.ExpiredSignatureError) when the token is not valid.
+    """
+    return jwt.decode(
+        token,
+        secret,
+        algorithms=['HS256'],
+        audience=audience,
+        options={'require': ['exp', 'sub']},
+    )
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """
+    Reads 'exp' from a token without verifying it, for tokens Supabase Auth has
+    already accepted, so cache entries never outlive the token. The payload is
+    decoded directly, so this works without PyJWT. None when there is no readable
+    'exp' (such tokens must not be cached).
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        expiry = float(claims['exp'])
+    except Exception:
+        return None
+    return expiry if math.isfinite(expiry) else None
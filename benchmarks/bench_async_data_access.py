@@ -0,0 +1,173 @@
+# benchmarks/bench_async_data_access.py
+"""
+Load test of the Supabase data access: the previous blocking client calls run
+in worker threads (asyncio.to_thread) against the async client, both served by
+in-memory stubs that take --latency-ms per round trip.
+
+  - full load of sales_raw_data at each --fetch-concurrency (1 pages the keyset
+    sequentially, higher values fetch id-range shards concurrently)
+  - throughput of concurrent authenticated API requests, every one with a new
+    token (so each needs the Auth round trip and the users lookup), at each
+    --concurrency level
+
+Run from the repository root:
+    python -m benchmarks.bench_async_data_access --rows 100000 --latency-ms 20
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pandas as pd
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from sales_data import IncrementalSalesLoader
+    from supabase_async import SupabaseApiError
+    from supabase_stub import AsyncStubSupabaseClient, StubSupabaseClient
+
+
+class _ThreadedSyncClient:
+    """The previous access pattern: blocking supabase-py style calls, each run via asyncio.to_thread."""
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], latency_seconds: float, users: Dict[str, Dict[str, Any]]):
+        self.sync_client = StubSupabaseClient(tables, latency_seconds=latency_seconds)
+        self.latency_seconds = latency_seconds
+        self.users = users
+
+    async def get_user(self, token: str) -> Dict[str, Any]:
+        def call():
+            time.sleep(self.latency_seconds)
+            if token not in self.users:
+                raise SupabaseApiError(401, "Invalid token")
+            return dict(self.users[token])
+        return await asyncio.to_thread(call)
+
+    async def select(self, table: str, columns: str = '*', filters=(), order: Optional[str] = None,
+                     descending: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        def call():
+            query = self.sync_client.from_(table).select(columns)
+            for column, operator, value in filters:
+                query = getattr(query, operator)(column, value)
+            if order:
+                query = query.order(order, desc=descending)
+            if limit is not None:
+                query = query.limit(limit)
+            return query.execute().data
+        return await asyncio.to_thread(call)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _load_results(rows, page_size, latency_seconds, fetch_concurrency, repeats):
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for concurrency in fetch_concurrency:
+            client = AsyncStubSupabaseClient({'sales_raw_data': rows}, latency_seconds=latency_seconds)
+
+            def async_load():
+                loader = IncrementalSalesLoader(page_size=page_size, concurrency=concurrency)
+                asyncio.run(loader.load_async(client, pd.DataFrame()))
+            results[f"async_concurrency_{concurrency}"] = {
+                "seconds": _best_of(async_load, repeats),
+                "max_in_flight": client.max_in_flight,
+            }
+    return results
+
+
+async def _request_throughput(client, n_requests, concurrency):
+    main.supabase_backend = client
+    main.invalidate_auth_caches()
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def one(i):
+            async with semaphore:
+                response = await http.get(
+                    "/api/dimensions/unique-values",
+                    params={"dimension": "region"},
+                    headers={"Authorization": f"Bearer token-{i}"},
+                )
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        return n_requests / (time.perf_counter() - start)
+
+
+def _throughput_results(rows, latency_seconds, concurrency_levels, n_requests):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = AsyncStubSupabaseClient({'sales_raw_data': rows})
+        asyncio.run(main.fetch_data_from_supabase(full_reload=True))
+
+    users = {f"token-{i}": {"id": f"user-{i}"} for i in range(n_requests)}
+    tables = {'users': [{"id": f"user-{i}", "Sales_Person": None} for i in range(n_requests)]}
+    results = {}
+    for concurrency in concurrency_levels:
+        with contextlib.redirect_stdout(io.StringIO()):
+            threaded = asyncio.run(_request_throughput(
+                _ThreadedSyncClient(tables, latency_seconds, users), n_requests, concurrency))
+            pooled = asyncio.run(_request_throughput(
+                AsyncStubSupabaseClient(tables, latency_seconds=latency_seconds, users=users), n_requests, concurrency))
+        results[concurrency] = {"threaded_requests_per_second": threaded, "async_requests_per_second": pooled}
+    return results
+
+
+def run(n_rows, page_size, latency_ms, fetch_concurrency, concurrency_levels, n_requests, repeats):
+    rows = make_sales_rows(rows=n_rows)
+    latency_seconds = latency_ms / 1000
+    return {
+        "rows": n_rows,
+        "page_size": page_size,
+        "latency_ms": latency_ms,
+        "load": _load_results(rows, page_size, latency_seconds, fetch_concurrency, repeats),
+        "requests": _throughput_results(rows, latency_seconds, concurrency_levels, n_requests),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated round trip per Supabase request")
+    parser.add_argument("--fetch-concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=256, help="Authenticated requests per concurrency level")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.page_size, args.latency_ms, args.fetch_concurrency,
+                  args.concurrency, args.requests, args.repeats)
+    print(f"rows={results['rows']} page_size={results['page_size']} latency={results['latency_ms']} ms per round trip")
+    print("full load")
+    for name, row in results["load"].items():
+        in_flight = f"   (max {row['max_in_flight']} in flight)" if "max_in_flight" in row else ""
+        print(f"  {name:<22} {row['seconds']:8.3f} s{in_flight}")
+    print(f"authenticated requests/s ({args.requests} requests, new token each)")
+    print(f"  {'concurrency':>11} {'threaded':>10} {'async':>10}")
+    for concurrency, row in results["requests"].items():
+        print(f"  {concurrency:>11} {row['threaded_requests_per_second']:>10.1f} {row['async_requests_per_second']:>10.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
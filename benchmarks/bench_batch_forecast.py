@@ -0,0 +1,101 @@
+# benchmarks/bench_batch_forecast.py
+"""
+Compares preparing forecasts for every value of a dimension with one request per
+value (what the dashboard did) against a single batch request, both for the
+series extraction alone (cube and raw rows) and end to end with the fitted
+models already in the model store, so the numbers show the per-request overhead
+rather than ARIMA time.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_forecast --rows 100000 --values 50
+"""
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import time
+
+os.environ.setdefault("FORECAST_FIT_WORKERS", "0")
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from forecast_cache import ForecastCache
+    from sales_data import normalize_sales_frame
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def _per_value_requests(months, values):
+    for value in values:
+        await main.generate_forecast_data(months, dimension_col="region", dimension_filter_value=value)
+
+
+def run(n_rows, n_values, months, repeats):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = None
+        main._install_sales_data(normalize_sales_frame(make_sales_rows(rows=n_rows, dimension_cardinality=n_values)))
+        snapshot = main.SALES_SNAPSHOT
+        raw_snapshot = dataclasses.replace(snapshot, cube=None)
+        values = main._dimension_values(snapshot, "region")
+
+    series = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        series["raw_per_value_seconds"] = _best_of(
+            lambda: [main._category_series_from_raw(raw_snapshot, None, "region", v) for v in values], repeats)
+        series["raw_batch_seconds"] = _best_of(
+            lambda: main._category_series_by_dimension_from_raw(raw_snapshot, "region", values), repeats)
+        series["cube_per_value_seconds"] = _best_of(
+            lambda: [snapshot.cube.category_series(None, "region", v) for v in values], repeats)
+        series["cube_batch_seconds"] = _best_of(
+            lambda: snapshot.cube.category_series_by_dimension("region", values), repeats)
+
+    end_to_end = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Warm up the model store so fitting doesn't dominate the measurement
+        asyncio.run(main.generate_batch_forecast_data(months, "region", values))
+        main.FORECAST_CACHE = ForecastCache(max_entries=0)
+        for name, active_snapshot in (("cube", snapshot), ("raw", raw_snapshot)):
+            main.SALES_SNAPSHOT = active_snapshot
+            end_to_end[f"{name}_per_value_seconds"] = _best_of(
+                lambda: asyncio.run(_per_value_requests(months, values)), repeats)
+            end_to_end[f"{name}_batch_seconds"] = _best_of(
+                lambda: asyncio.run(main.generate_batch_forecast_data(months, "region", values)), repeats)
+
+    return {"rows": n_rows, "values": len(values), "series": series, "end_to_end": end_to_end}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--values", type=int, default=50)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    result = run(args.rows, args.values, args.months, args.repeats)
+    print(f"rows={result['rows']} values={result['values']}")
+    for section in ("series", "end_to_end"):
+        timing = result[section]
+        for source in ("raw", "cube"):
+            print(f"  {section:<10} {source:<4} per-value {timing[f'{source}_per_value_seconds'] * 1000:9.1f} ms   "
+                  f"batch {timing[f'{source}_batch_seconds'] * 1000:9.1f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
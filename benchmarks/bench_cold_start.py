@@ -0,0 +1,80 @@
+# benchmarks/bench_cold_start.py
+"""
+Compares cold-start time of the normalized sales frame when it is fetched from
+the network (simulated with a stub client, optionally with per-page latency)
+and when it is memory-mapped from the local Arrow snapshot.
+
+Run from the repository root:
+    python -m benchmarks.bench_cold_start --rows 100000 1000000 --page-latency-ms 50
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_sales_rows
+from sales_data import IncrementalSalesLoader
+from snapshot_store import load_snapshot, save_snapshot, snapshots_available
+from supabase_stub import AsyncStubSupabaseClient
+
+
+def run(row_counts, page_size, page_latency_ms):
+    results = []
+    for n_rows in row_counts:
+        client = AsyncStubSupabaseClient({'sales_raw_data': make_sales_rows(rows=n_rows)}, latency_seconds=page_latency_ms / 1000)
+        loader = IncrementalSalesLoader(page_size=page_size)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            sales_df, _, high_water_mark = asyncio.run(loader.load_async(client, pd.DataFrame()))
+            loader.commit_high_water_mark(high_water_mark)
+            network_seconds = time.perf_counter() - start
+
+            with tempfile.TemporaryDirectory() as snapshot_dir:
+                start = time.perf_counter()
+                save_snapshot(sales_df, snapshot_dir, {"last_id": loader.last_id})
+                write_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                restored_df, _ = load_snapshot(snapshot_dir)
+                snapshot_seconds = time.perf_counter() - start
+
+        assert len(restored_df) == len(sales_df)
+        results.append({
+            "rows": n_rows,
+            "network_seconds": network_seconds,
+            "snapshot_write_seconds": write_seconds,
+            "snapshot_load_seconds": snapshot_seconds,
+            "speedup": network_seconds / snapshot_seconds if snapshot_seconds else None,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--page-latency-ms", type=float, default=0.0, help="Simulated round-trip time per page")
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    if not snapshots_available():
+        raise SystemExit("pyarrow is required for the snapshot benchmark.")
+
+    results = run(args.rows, args.page_size, args.page_latency_ms)
+    print(f"{'rows':>9} {'network s':>10} {'snap write s':>13} {'snap load s':>12} {'speedup':>8}")
+    for row in results:
+        print(f"{row['rows']:>9} {row['network_seconds']:>10.3f} {row['snapshot_write_seconds']:>13.3f} "
+              f"{row['snapshot_load_seconds']:>12.3f} {row['speedup']:>8.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
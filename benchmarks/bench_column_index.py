@@ -0,0 +1,89 @@
+# benchmarks/bench_column_index.py
+"""
+Compares memory and filter latency of the normalized sales frame with plain
+string columns against the dictionary-encoded frame with column indexes.
+
+Run from the repository root:
+    python -m benchmarks.bench_column_index --rows 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_sales_rows
+from column_index import build_column_indexes, encode_categorical_columns
+from sales_data import normalize_sales_frame
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(row_counts, repeats):
+    results = []
+    for n_rows in row_counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            plain_df = normalize_sales_frame(make_sales_rows(rows=n_rows))
+        encoded_df = encode_categorical_columns(plain_df.copy(), ['category', 'sales_person', 'region', 'product', 'channel'])
+        start = time.perf_counter()
+        indexes = build_column_indexes(encoded_df)
+        index_seconds = time.perf_counter() - start
+
+        def string_filter():
+            mask = plain_df['sales_person'].astype(str).str.lower() == 'sales person 3'
+            mask &= plain_df['region'].astype(str).str.lower() == 'region 5'
+            return plain_df[mask]
+
+        def index_filter():
+            positions = np.intersect1d(
+                indexes['sales_person'].positions('sales person 3'),
+                indexes['region'].positions('region 5'),
+                assume_unique=True,
+            )
+            return encoded_df.iloc[positions]
+
+        def string_unique():
+            return sorted(plain_df['region'].dropna().astype(str).str.strip().str.lower().unique())
+
+        results.append({
+            "rows": n_rows,
+            "plain_bytes": int(plain_df.memory_usage(deep=True).sum()),
+            "encoded_bytes": int(encoded_df.memory_usage(deep=True).sum()),
+            "index_build_seconds": index_seconds,
+            "string_filter_seconds": _best_of(string_filter, repeats),
+            "index_filter_seconds": _best_of(index_filter, repeats),
+            "string_unique_seconds": _best_of(string_unique, repeats),
+            "index_unique_seconds": _best_of(lambda: indexes['region'].unique_values(), repeats),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeats)
+    for row in results:
+        print(f"rows={row['rows']} memory: plain {row['plain_bytes'] / 1e6:.1f} MB, encoded {row['encoded_bytes'] / 1e6:.1f} MB "
+              f"(indexes built in {row['index_build_seconds'] * 1000:.1f} ms)")
+        print(f"  filter  string {row['string_filter_seconds'] * 1000:8.2f} ms   index {row['index_filter_seconds'] * 1000:8.2f} ms")
+        print(f"  unique  string {row['string_unique_seconds'] * 1000:8.2f} ms   index {row['index_unique_seconds'] * 1000:8.2f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_concurrent_memory.py
+"""
+Measures peak traced memory while N forecast requests run concurrently against
+one shared sales snapshot, next to the peak of the previous behaviour where every
+request held its own copy of the full frame.
+
+Model fits are warmed up first and the forecast cache is disabled, so the numbers
+reflect the data path (filtering, resampling, assembling) rather than fitting.
+
+Run from the repository root:
+    python -m benchmarks.bench_concurrent_memory --rows 200000 --concurrency 1 4 16
+"""
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import tracemalloc
+
+os.environ.setdefault("FORECAST_FIT_WORKERS", "0")
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from forecast_cache import ForecastCache
+    from sales_data import normalize_sales_frame
+
+
+REQUESTS = [
+    {"sales_person_filter": None},
+    {"sales_person_filter": "Sales Person 1"},
+    {"sales_person_filter": "Sales Person 2", "dimension_col": "region", "dimension_filter_value": "region 3"},
+    {"dimension_col": "channel", "dimension_filter_value": "channel 4"},
+]
+
+
+async def _concurrent_requests(n):
+    await asyncio.gather(*(main.generate_forecast_data(6, **REQUESTS[i % len(REQUESTS)]) for i in range(n)))
+
+
+async def _concurrent_legacy_copies(n):
+    async def hold_copy():
+        df = main.SALES_SNAPSHOT.frame.copy()
+        await asyncio.sleep(0.01)
+        return len(df)
+    await asyncio.gather(*(hold_copy() for _ in range(n)))
+
+
+def _peak(coro_factory):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(coro_factory())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(n_rows, concurrency, use_cube):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = None
+        if not use_cube:
+            main.CUBE_DIMENSIONS = ["__none__"]
+        main._install_sales_data(normalize_sales_frame(make_sales_rows(rows=n_rows)))
+        if not use_cube:
+            main.SALES_SNAPSHOT = dataclasses.replace(main.SALES_SNAPSHOT, cube=None)
+        # Warm up the model store so fitting doesn't dominate the measurement
+        asyncio.run(_concurrent_requests(len(REQUESTS)))
+    main.FORECAST_CACHE = ForecastCache(max_entries=0)
+
+    frame_bytes = int(main.SALES_SNAPSHOT.frame.memory_usage(deep=True).sum())
+    results = []
+    for n in concurrency:
+        results.append({
+            "rows": n_rows,
+            "cube": use_cube,
+            "concurrency": n,
+            "frame_bytes": frame_bytes,
+            "snapshot_peak_bytes": _peak(lambda: _concurrent_requests(n)),
+            "legacy_copy_peak_bytes": _peak(lambda: _concurrent_legacy_copies(n)),
+        })
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--raw-scan", action="store_true", help="Disable the monthly cube so requests filter raw rows")
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.concurrency, use_cube=not args.raw_scan)
+    print(f"rows={args.rows} frame={results[0]['frame_bytes'] / 1e6:.1f} MB cube={'on' if results[0]['cube'] else 'off'}")
+    print(f"{'concurrency':>11} {'snapshot peak MB':>17} {'per-request copy peak MB':>25}")
+    for row in results:
+        print(f"{row['concurrency']:>11} {row['snapshot_peak_bytes'] / 1e6:>17.1f} {row['legacy_copy_peak_bytes'] / 1e6:>25.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,85 @@
+# benchmarks/bench_cube.py
+"""
+Compares slicing per-category monthly series from the pre-aggregated cube with
+filtering and resampling the raw transactions, per request, and reports the
+memory held by each.
+
+Run from the repository root:
+    python -m benchmarks.bench_cube --rows 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from sales_cube import detect_dimension_columns
+    from sales_data import normalize_sales_frame
+    from sales_snapshot import SalesSnapshot
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(row_counts, repeats):
+    results = []
+    for n_rows in row_counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sales_df = normalize_sales_frame(make_sales_rows(rows=n_rows))
+            raw_frame_bytes = int(sales_df.memory_usage(deep=True).sum())
+            snapshot = SalesSnapshot.build(sales_df, 1, detect_dimension_columns(sales_df, 1000))
+            cube = snapshot.cube
+
+        requests = {
+            "all": (None, None, None),
+            "sales_person": ("sales person 3", None, None),
+            "dimension": (None, "region", "region 5"),
+            "sales_person+dimension": ("sales person 3", "region", "region 5"),
+        }
+        row = {
+            "rows": n_rows,
+            "raw_frame_bytes": raw_frame_bytes,
+            "cube_cells": len(cube),
+            "cube_bytes": cube.nbytes,
+            "cube_build_seconds": cube.build_seconds,
+            "requests": {},
+        }
+        for name, (sales_person, dimension_col, dimension_value) in requests.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                raw_seconds = _best_of(lambda: main._category_series_from_raw(snapshot, sales_person, dimension_col, dimension_value), repeats)
+                cube_seconds = _best_of(lambda: cube.category_series(sales_person, dimension_col, dimension_value), repeats)
+            row["requests"][name] = {"raw_seconds": raw_seconds, "cube_seconds": cube_seconds}
+        results.append(row)
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeats)
+    for row in results:
+        print(f"rows={row['rows']} raw frame={row['raw_frame_bytes'] / 1e6:.1f} MB "
+              f"cube={row['cube_bytes'] / 1e6:.2f} MB ({row['cube_cells']} cells, built in {row['cube_build_seconds']:.3f}s)")
+        for name, timing in row["requests"].items():
+            print(f"  {name:<24} raw {timing['raw_seconds'] * 1000:8.1f} ms   cube {timing['cube_seconds'] * 1000:8.1f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,91 @@
+# benchmarks/bench_dimension_catalogue.py
+"""
+Compares /api/dimensions/unique-values computed per call (filter the frame by
+sales person, then normalize, dedupe and sort the column, as before the
+catalogue) with reading the snapshot's precomputed dimension catalogue, for an
+indexed dimension and a high-cardinality one searched by prefix, plus what the
+catalogue adds to building a snapshot.
+
+Run from the repository root:
+    python -m benchmarks.bench_dimension_catalogue --rows 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import json
+import time
+
+from benchmarks.synthetic import make_sales_rows
+from dimension_catalogue import DimensionCatalogue
+from sales_data import normalize_sales_frame
+from sales_snapshot import SalesSnapshot
+
+DIMENSIONS = ['region', 'product', 'channel']
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(row_counts, repeats):
+    results = []
+    for n_rows in row_counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            frame = normalize_sales_frame(make_sales_rows(rows=n_rows))
+            # A made-up high-cardinality column (one value per customer-like id)
+            frame['customer'] = (frame.index.to_series() % max(n_rows // 10, 1)).map('customer {:07d}'.format).to_numpy()
+            snapshot = SalesSnapshot.build(frame, 1, DIMENSIONS)
+        df = snapshot.frame
+        sales_person = str(df['sales_person'].iloc[0]).lower()
+
+        def per_call(column, prefix=None):
+            rows = df[df['sales_person'].astype(str).str.lower() == sales_person]
+            values = sorted(rows[column].dropna().astype(str).str.strip().str.lower().unique().tolist())
+            if prefix:
+                values = [value for value in values if value.startswith(prefix)]
+            return values[:50]
+
+        def catalogue(column, prefix=None):
+            dimension_values = snapshot.catalogue.dimension(column, sales_person)
+            positions, _ = dimension_values.search(prefix, 0, 50)
+            return dimension_values.values(positions)
+
+        results.append({
+            "rows": n_rows,
+            "catalogue_build_seconds": _best_of(lambda: DimensionCatalogue(df, snapshot.indexes), repeats),
+            "customer_build_seconds": _best_of(lambda: DimensionCatalogue(df, snapshot.indexes, ['customer']), repeats),
+            "region_per_call_seconds": _best_of(lambda: per_call('region'), repeats),
+            "region_catalogue_seconds": _best_of(lambda: catalogue('region'), repeats),
+            "customer_prefix_per_call_seconds": _best_of(lambda: per_call('customer', 'customer 00012'), repeats),
+            "customer_prefix_catalogue_seconds": _best_of(lambda: catalogue('customer', 'customer 00012'), repeats),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeats)
+    for row in results:
+        print(f"rows={row['rows']} catalogue built in {row['catalogue_build_seconds'] * 1000:.1f} ms "
+              f"({row['customer_build_seconds'] * 1000:.1f} ms of it for the unindexed customer column)")
+        print(f"  region           per call {row['region_per_call_seconds'] * 1000:8.2f} ms   "
+              f"catalogue {row['region_catalogue_seconds'] * 1000:8.3f} ms")
+        print(f"  customer prefix  per call {row['customer_prefix_per_call_seconds'] * 1000:8.2f} ms   "
+              f"catalogue {row['customer_prefix_catalogue_seconds'] * 1000:8.3f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_forecasters.py
+"""
+Compares the forecasting engines (FORECAST_ENGINES) on the synthetic sales
+fixture: every category series of the overall, per-sales-person and
+per-region views is cut `--holdout` months before its end, forecast by each
+engine, and scored against the held-out months (WAPE). Latency is measured
+for one request's categories and for all series at once, with the ARIMA model
+store emptied before every run. A last-value forecast is listed for scale.
+
+Run from the repository root:
+    python -m benchmarks.bench_forecasters --rows 100000 --holdout 6
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("FORECAST_ORDER_CRITERION", "off")
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from model_store import FittedModelStore
+    from sales_data import normalize_sales_frame
+
+
+def fixture_series(n_rows):
+    """(name, monthly series) for every category of the overall, per-sales-person and per-region views."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = None
+        main._install_sales_data(normalize_sales_frame(make_sales_rows(rows=n_rows)))
+    cube = main.SALES_SNAPSHOT.cube
+    views = [("all", cube.category_series())]
+    views += [(person, cube.category_series(sales_person=person)) for person in sorted(cube.sales_person_codes)]
+    views += [(f"region={value}", series) for value, series in cube.category_series_by_dimension("region").items()]
+    return [(f"{view} / {category}", ts) for view, series in views for category, ts in series.items()]
+
+
+def _run_engine(engine, category_series, months, current_month_start):
+    main.PREDICTION_MODELS = FittedModelStore()
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        forecasts = asyncio.run(engine.forecast(category_series, months, current_month_start))
+        return forecasts, time.perf_counter() - start
+
+
+def run(n_rows, holdout):
+    series = fixture_series(n_rows)
+    # Every fixture series ends in the same month, so one cut-off serves them all
+    cutoff = max(ts.index.max() for _, ts in series) - pd.DateOffset(months=holdout - 1)
+    actuals = np.array([ts.reindex(pd.date_range(cutoff, periods=holdout, freq="MS")).fillna(0).to_numpy() for _, ts in series])
+    request_series = series[:8]
+
+    results = {"rows": n_rows, "series": len(series), "holdout": holdout, "engines": {}}
+    for name, engine in main.FORECAST_ENGINES.items():
+        _, request_seconds = _run_engine(engine, request_series, holdout, cutoff)
+        forecasts, all_seconds = _run_engine(engine, series, holdout, cutoff)
+        predicted = np.nan_to_num(np.array([f.to_numpy() for f in forecasts]))
+        results["engines"][name] = {
+            "request_seconds": request_seconds,
+            "all_series_seconds": all_seconds,
+            "wape": float(np.abs(predicted - actuals).sum() / np.abs(actuals).sum()),
+        }
+
+    last_values = np.array([ts[ts.index < cutoff].iloc[-1] for _, ts in series])
+    results["engines"]["last_value"] = {
+        "request_seconds": 0.0,
+        "all_series_seconds": 0.0,
+        "wape": float(np.abs(last_values[:, None] - actuals).sum() / np.abs(actuals).sum()),
+    }
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--holdout", type=int, default=6)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.holdout)
+    print(f"rows={results['rows']} series={results['series']} holdout={results['holdout']} months")
+    for name, row in results["engines"].items():
+        print(f"  {name:<10} 8 categories {row['request_seconds'] * 1000:8.1f} ms   all series {row['all_series_seconds'] * 1000:9.1f} ms   "
+              f"WAPE {row['wape'] * 100:6.2f}%")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,170 @@
+# benchmarks/bench_hierarchy.py
+"""
+Compares the compute cost of the two ways of serving forecasts after a data
+refresh, on the synthetic sales fixture:
+
+  - per request (FORECAST_HIERARCHY=off): every distinct view fits its own
+    category series when it is first requested
+  - bottom-up (FORECAST_HIERARCHY=bottom_up): one refresh fits every sales
+    person x category series (x --hierarchy-dimensions); views are then sums
+
+The traffic after a refresh is every view requested once (repeats are served by
+the forecast cache either way): the total, each sales person's view, and the
+total filtered on each value of --dimension. Forecasts start --holdout months
+before the data ends, so each mode is also scored against those months (WAPE).
+The ARIMA model store is emptied before each mode.
+
+Run from the repository root:
+    python -m benchmarks.bench_hierarchy --rows 100000 --engine holt arima
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("FORECAST_ORDER_CRITERION", "off")
+warnings.simplefilter("ignore")
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from forecasters import Forecaster
+    from hierarchical_forecast import BottomUpForecasts
+    from model_store import FittedModelStore
+    from sales_data import normalize_sales_frame
+
+
+class _CountingForecaster(Forecaster):
+    """Passes through to an engine, counting the series it is asked to fit."""
+
+    def __init__(self, engine: Forecaster):
+        self.engine = engine
+        self.name = engine.name
+        self.series = 0
+
+    async def forecast(self, category_series, months, current_month_start):
+        self.series += len(category_series)
+        return await self.engine.forecast(category_series, months, current_month_start)
+
+
+def _views(snapshot, dimension):
+    views = [("total", None, None, None)]
+    views += [(f"sales_person={person}", person, None, None) for person in sorted(snapshot.cube.sales_person_codes)]
+    views += [(f"{dimension}={value}", None, dimension, value) for value in sorted(snapshot.cube.dimension_codes[dimension])]
+    return views
+
+
+def _wape(records_by_view, snapshot, views):
+    """Weighted absolute percentage error of all views' forecasts over the held-out months."""
+    error = total = 0.0
+    for name, sales_person, dimension, value in views:
+        actuals = dict(main._category_series_for_request(snapshot, sales_person, dimension, value))
+        for record in records_by_view[name]:
+            if record["forecast"] is None:
+                continue
+            actual = actuals[record["category"]].get(pd.Timestamp(record["date"]), 0.0)
+            error += abs(record["forecast"] - actual)
+            total += abs(actual)
+    return error / total if total else None
+
+
+async def _serve(snapshot, views, forecaster_for, months, cutoff):
+    latencies, records_by_view = [], {}
+    for name, sales_person, dimension, value in views:
+        start = time.perf_counter()
+        records_by_view[name], _ = await main._build_forecast_data(
+            snapshot, forecaster_for(sales_person, dimension, value), months, cutoff, sales_person, dimension, value
+        )
+        latencies.append(time.perf_counter() - start)
+    return latencies, records_by_view
+
+
+def _summary(refresh_seconds, latencies, fitted_series, wape):
+    return {
+        "refresh_seconds": refresh_seconds,
+        "requests_seconds": float(sum(latencies)),
+        "total_seconds": refresh_seconds + float(sum(latencies)),
+        "request_p50_seconds": float(np.percentile(latencies, 50)),
+        "request_max_seconds": float(max(latencies)),
+        "fitted_series": fitted_series,
+        "wape": wape,
+    }
+
+
+def run(n_rows, engines, months, holdout, dimension, hierarchy_dimensions):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = None
+        main._install_sales_data(normalize_sales_frame(make_sales_rows(rows=n_rows)))
+    snapshot = main.SALES_SNAPSHOT
+    cube = snapshot.cube
+    last_month = pd.Timestamp(year=(cube.first_month + cube.n_months - 1) // 12, month=(cube.first_month + cube.n_months - 1) % 12 + 1, day=1)
+    cutoff = (last_month - pd.DateOffset(months=holdout - 1)).to_pydatetime()
+    views = _views(snapshot, dimension)
+
+    results = {"rows": n_rows, "views": len(views), "months": months, "holdout": holdout, "engines": {}}
+    for engine_name in engines:
+        engine = _CountingForecaster(main.get_forecast_engine(engine_name))
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.PREDICTION_MODELS = FittedModelStore()
+            latencies, records = asyncio.run(_serve(snapshot, views, lambda *view: engine, months, cutoff))
+            per_request = _summary(0.0, latencies, engine.series, _wape(records, snapshot, views))
+
+            main.PREDICTION_MODELS = FittedModelStore()
+            engine.series = 0
+            start = time.perf_counter()
+            hierarchy = asyncio.run(BottomUpForecasts.build(cube, engine, snapshot.version, months, cutoff, hierarchy_dimensions))
+            refresh_seconds = time.perf_counter() - start
+
+            def forecaster_for(sales_person, dimension_col, value):
+                if hierarchy.covers(engine.name, months, dimension_col):
+                    return hierarchy.forecaster_for(sales_person, dimension_col, value, fallback=engine)
+                return engine
+            latencies, records = asyncio.run(_serve(snapshot, views, forecaster_for, months, cutoff))
+            bottom_up = _summary(refresh_seconds, latencies, engine.series, _wape(records, snapshot, views))
+        results["engines"][engine_name] = {
+            "per_request": per_request,
+            "bottom_up": bottom_up,
+            "bottom_level_series": len(hierarchy),
+            "missing_series": hierarchy.stats()["missing_series"],
+            "stale_series": hierarchy.stats()["stale_series"],
+        }
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--engine", nargs="+", default=["holt", "arima"])
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--holdout", type=int, default=6)
+    parser.add_argument("--dimension", default="region", help="Dimension whose per-value views are part of the traffic")
+    parser.add_argument("--hierarchy-dimensions", nargs="*", default=[], help="FORECAST_HIERARCHY_DIMENSIONS")
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.engine, args.months, args.holdout, args.dimension, args.hierarchy_dimensions)
+    print(f"rows={results['rows']} views={results['views']} months={results['months']} holdout={results['holdout']}")
+    print(f"  {'engine':<7} {'mode':<12} {'refresh s':>10} {'requests s':>11} {'total s':>8} {'p50 ms':>8} "
+          f"{'max ms':>8} {'fitted':>7} {'WAPE':>6}")
+    for engine_name, modes in results["engines"].items():
+        for mode in ("per_request", "bottom_up"):
+            row = modes[mode]
+            print(f"  {engine_name:<7} {mode:<12} {row['refresh_seconds']:>10.3f} {row['requests_seconds']:>11.3f} "
+                  f"{row['total_seconds']:>8.3f} {row['request_p50_seconds'] * 1000:>8.1f} {row['request_max_seconds'] * 1000:>8.1f} "
+                  f"{row['fitted_series']:>7} {row['wape'] * 100:>5.1f}%")
+        print(f"  {engine_name:<7} ({modes['bottom_level_series']} bottom-level series, {modes['missing_series']} without a forecast, {modes['stale_series']} stale)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,112 @@
+# benchmarks/bench_incremental_refit.py
+"""
+Replays month closes on synthetic monthly series and compares refitting ARIMA
+from scratch every month with appending the new month to the stored fit and
+with warm-starting the refit from the previous parameters, under the
+FORECAST_FULL_REFIT_EVERY policy. Reports fit time and the forecast drift of
+each mode against the full refit of the same month.
+
+Run from the repository root:
+    python -m benchmarks.bench_incremental_refit --series 20 --history 48 --closes 12
+"""
+import argparse
+import json
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from forecast_workers import append_arima, fit_arima
+
+
+ORDER = (1, 1, 1)
+
+
+def make_series(n_series, n_months, seed=0):
+    """Monthly revenue with a per-series trend, yearly seasonality and noise."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2018-01-01", periods=n_months, freq="MS")
+    months = np.arange(n_months)
+    series = []
+    for _ in range(n_series):
+        level = rng.uniform(5_000, 50_000)
+        trend = rng.uniform(-0.002, 0.01)
+        season = 1 + rng.uniform(0.05, 0.3) * np.sin(2 * np.pi * (months + rng.integers(12)) / 12)
+        noise = rng.lognormal(0, 0.1, size=n_months)
+        series.append(pd.Series(level * (1 + trend) ** months * season * noise, index=index))
+    return series
+
+
+def replay(ts, history, closes, horizon, mode, full_refit_every):
+    """Fits on `history` months, then adds one month at a time; returns (seconds, forecasts) per close."""
+    model_fit = fit_arima(ts.iloc[:history], ORDER)
+    updates = 0
+    results = []
+    for n in range(history + 1, history + closes + 1):
+        train = ts.iloc[:n]
+        start = time.perf_counter()
+        if mode == "full" or updates + 1 >= full_refit_every:
+            model_fit = fit_arima(train, ORDER)
+            updates = 0
+        elif mode == "append":
+            model_fit = append_arima(model_fit, train.iloc[-1:])
+            updates += 1
+        else:
+            model_fit = fit_arima(train, ORDER, model_fit.params)
+            updates += 1
+        seconds = time.perf_counter() - start
+        forecast = np.asarray(model_fit.predict(start=n, end=n + horizon - 1))
+        results.append((seconds, forecast))
+    return results
+
+
+def run(n_series, history, closes, horizon, full_refit_every):
+    all_series = make_series(n_series, history + closes)
+    results = {"series": n_series, "history": history, "closes": closes, "full_refit_every": full_refit_every, "modes": {}}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        replays = {
+            mode: [replay(ts, history, closes, horizon, mode, full_refit_every) for ts in all_series]
+            for mode in ("full", "append", "warm")
+        }
+
+    for mode, per_series in replays.items():
+        seconds = [s for series in per_series for s, _ in series]
+        drift = []
+        for series, reference in zip(per_series, replays["full"]):
+            for (_, forecast), (_, full_forecast) in zip(series, reference):
+                drift.append(np.max(np.abs(forecast - full_forecast) / np.maximum(np.abs(full_forecast), 1e-9)))
+        results["modes"][mode] = {
+            "fit_seconds_total": float(np.sum(seconds)),
+            "fit_seconds_mean": float(np.mean(seconds)),
+            "drift_median": float(np.median(drift)),
+            "drift_mean": float(np.mean(drift)),
+            "drift_max": float(np.max(drift)),
+        }
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=20)
+    parser.add_argument("--history", type=int, default=48)
+    parser.add_argument("--closes", type=int, default=12)
+    parser.add_argument("--horizon", type=int, default=6)
+    parser.add_argument("--full-refit-every", type=int, default=6)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.series, args.history, args.closes, args.horizon, args.full_refit_every)
+    print(f"series={results['series']} history={results['history']} closes={results['closes']} "
+          f"full refit every {results['full_refit_every']} updates")
+    for mode, row in results["modes"].items():
+        print(f"  {mode:<7} fits {row['fit_seconds_total']:7.2f} s ({row['fit_seconds_mean'] * 1000:6.1f} ms each)   "
+              f"drift vs full refit: median {row['drift_median'] * 100:6.3f}%  mean {row['drift_mean'] * 100:6.3f}%  max {row['drift_max'] * 100:6.3f}%")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,102 @@
+# benchmarks/bench_instrumentation.py
+"""
+Measures what logging and instrumentation cost a forecast request: the request
+path (series extraction from the cube and from raw rows, the holt engine and
+record assembly, with the forecast cache bypassed) with the debug lines built
+(LOG_LEVEL=DEBUG, output discarded) and skipped (the default), plus the
+overhead of one timing span and of rendering /metrics.
+
+Run from the repository root:
+    python -m benchmarks.bench_instrumentation --rows 100000 --repeats 5
+"""
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import io
+import json
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import instrumentation
+    import main
+    from sales_data import normalize_sales_frame
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _set_debug_logging(enabled):
+    # Both modules read their flag at call time
+    main.DEBUG_LOGGING = instrumentation.DEBUG_LOGGING = enabled
+
+
+def _request(snapshot, months, sales_person):
+    current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    forecaster = main.get_forecast_engine("holt")
+
+    def run_once():
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(main._build_forecast_data(snapshot, forecaster, months, current_month_start, sales_person))
+    return run_once
+
+
+def run(n_rows, months, repeats):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = None
+        main._install_sales_data(normalize_sales_frame(make_sales_rows(rows=n_rows)))
+    snapshot = main.SALES_SNAPSHOT
+    sales_person = sorted(snapshot.cube.sales_person_codes)[0]
+    paths = {"cube": snapshot, "raw_rows": dataclasses.replace(snapshot, cube=None)}
+
+    results = {"rows": n_rows, "months": months, "requests": {}}
+    for name, path_snapshot in paths.items():
+        request = _request(path_snapshot, months, sales_person)
+        _set_debug_logging(True)
+        debug_seconds = _best_of(request, repeats)
+        _set_debug_logging(False)
+        info_seconds = _best_of(request, repeats)
+        results["requests"][name] = {"debug_seconds": debug_seconds, "info_seconds": info_seconds}
+
+    n_spans = 100_000
+
+    def spans():
+        for _ in range(n_spans):
+            with instrumentation.span("bench"):
+                pass
+    results["span_overhead_seconds"] = _best_of(spans, repeats) / n_spans
+    results["metrics_render_seconds"] = _best_of(instrumentation.METRICS.render, repeats)
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.months, args.repeats)
+    print(f"rows={results['rows']} months={results['months']} (holt engine, forecast cache bypassed)")
+    for name, row in results["requests"].items():
+        print(f"  {name:<9} LOG_LEVEL=DEBUG {row['debug_seconds'] * 1000:8.2f} ms   "
+              f"INFO {row['info_seconds'] * 1000:8.2f} ms   ({row['debug_seconds'] / row['info_seconds']:.1f}x)")
+    print(f"  span overhead {results['span_overhead_seconds'] * 1e6:.2f} us   "
+          f"/metrics render {results['metrics_render_seconds'] * 1000:.2f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,139 @@
+# benchmarks/bench_order_selection.py
+"""
+Reports the cost of the stepwise ARIMA order search (fits, seconds, and wall time
+with each level's candidates fitted concurrently on a process pool, as the app does)
+against scoring the whole grid, and its accuracy gain over
+the fixed ARIMA(1,1,1) on held-out months of synthetic series generated by
+different ARIMA processes.
+
+Run from the repository root:
+    python -m benchmarks.bench_order_selection --series 24 --months 60 --holdout 6
+"""
+import argparse
+import asyncio
+import json
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from forecast_workers import fit_arima, score_arima_order
+from order_selection import DEFAULT_ARIMA_ORDER, candidate_order_levels, stepwise_order_search
+
+
+def make_series(n_series, n_months, seed=0):
+    """
+    Integrated ARMA(p, q) series with random coefficients (|ar| sums below 1, so the
+    differenced process is stationary) around a positive level.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2018-01-01", periods=n_months, freq="MS")
+    series = []
+    for i in range(n_series):
+        p, q = i % 3, (i // 3) % 3
+        ar = rng.uniform(-0.45, 0.45, size=p)
+        ma = rng.uniform(-0.7, 0.7, size=q)
+        noise = rng.normal(0, 1, size=n_months + 50)
+        diff = np.zeros(n_months + 50)
+        for t in range(len(diff)):
+            diff[t] = noise[t] + sum(ar[k] * diff[t - k - 1] for k in range(p) if t - k - 1 >= 0) \
+                + sum(ma[k] * noise[t - k - 1] for k in range(q) if t - k - 1 >= 0)
+        values = 5_000 + 20 * np.cumsum(diff[50:]) + rng.uniform(0, 500)
+        series.append(pd.Series(values, index=index))
+    return series
+
+
+def _forecast_error(ts, order, holdout):
+    train, test = ts.iloc[:-holdout], ts.iloc[-holdout:].to_numpy()
+    forecast = np.asarray(fit_arima(train, order).predict(start=len(train), end=len(train) + holdout - 1))
+    # Weighted absolute percentage error over the held-out months
+    return float(np.sum(np.abs(forecast - test)) / np.sum(np.abs(test)))
+
+
+def _search(ts, levels, criterion, executor=None):
+    """The stepwise search, scoring each level in this process or concurrently on `executor`."""
+    async def score_level(level):
+        if executor is None:
+            return [score_arima_order(ts, order, criterion) for order in level]
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(loop.run_in_executor(executor, score_arima_order, ts, order, criterion) for order in level))
+    return asyncio.run(stepwise_order_search(score_level, levels))
+
+
+def _grid_search(ts, levels, criterion):
+    scores = [(score_arima_order(ts, order, criterion), order) for level in levels for order in level]
+    return min(scores, key=lambda item: item[0])[1]
+
+
+def run(n_series, n_months, holdout, criterion, max_p, max_q, workers):
+    levels = candidate_order_levels(max_p, 1, max_q)
+    all_series = make_series(n_series, n_months)
+    trains = [ts.iloc[:-holdout] for ts in all_series]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        stepwise = [_search(train, levels, criterion) for train in trains]
+        stepwise_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        grid_orders = [_grid_search(train, levels, criterion) for train in trains]
+        grid_seconds = time.perf_counter() - start
+
+        default_error = [_forecast_error(ts, DEFAULT_ARIMA_ORDER, holdout) for ts in all_series]
+        stepwise_error = [_forecast_error(ts, order or DEFAULT_ARIMA_ORDER, holdout) for ts, (order, _, _) in zip(all_series, stepwise)]
+        grid_error = [_forecast_error(ts, order, holdout) for ts, order in zip(all_series, grid_orders)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        _search(trains[0], levels, criterion, executor) # warm up the workers
+        start = time.perf_counter()
+        for train in trains:
+            _search(train, levels, criterion, executor)
+        parallel_seconds = time.perf_counter() - start
+
+    return {
+        "series": n_series,
+        "months": n_months,
+        "holdout": holdout,
+        "criterion": criterion,
+        "grid_size": sum(len(level) for level in levels),
+        "stepwise_fits_mean": float(np.mean([fits for _, _, fits in stepwise])),
+        "stepwise_seconds_per_series": stepwise_seconds / n_series,
+        "grid_seconds_per_series": grid_seconds / n_series,
+        "stepwise_parallel_wall_seconds": parallel_seconds,
+        "workers": workers,
+        "wape": {
+            "default_order": float(np.mean(default_error)),
+            "stepwise": float(np.mean(stepwise_error)),
+            "full_grid": float(np.mean(grid_error)),
+        },
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=24)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--holdout", type=int, default=6)
+    parser.add_argument("--criterion", choices=["aic", "bic"], default="aic")
+    parser.add_argument("--max-p", type=int, default=2)
+    parser.add_argument("--max-q", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    r = run(args.series, args.months, args.holdout, args.criterion, args.max_p, args.max_q, args.workers)
+    print(f"series={r['series']} months={r['months']} holdout={r['holdout']} criterion={r['criterion']} grid={r['grid_size']} orders")
+    print(f"  search cost  stepwise {r['stepwise_fits_mean']:.1f} fits, {r['stepwise_seconds_per_series'] * 1000:.0f} ms/series   "
+          f"full grid {r['grid_size']} fits, {r['grid_seconds_per_series'] * 1000:.0f} ms/series   "
+          f"stepwise on {r['workers']} workers: {r['stepwise_parallel_wall_seconds']:.2f} s wall for all series")
+    print(f"  held-out WAPE  ARIMA{DEFAULT_ARIMA_ORDER} {r['wape']['default_order'] * 100:.3f}%   "
+          f"stepwise {r['wape']['stepwise'] * 100:.3f}%   full grid {r['wape']['full_grid'] * 100:.3f}%")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(r, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,87 @@
+# benchmarks/bench_parallel_fit.py
+"""
+Measures how wall-clock time of the per-category ARIMA fits scales with the
+number of categories and the size of the fitting process pool.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel_fit --categories 4 16 64 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import json
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from fit_pool import FitPool
+from forecast_workers import fit_arima
+
+
+def make_series(n_categories: int, n_months: int, seed: int = 0):
+    """Synthetic monthly revenue series: trend + yearly seasonality + noise."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n_months, freq="MS")
+    t = np.arange(n_months)
+    series = []
+    for _ in range(n_categories):
+        level = rng.uniform(1_000, 10_000)
+        values = level + rng.uniform(-20, 60) * t + level * 0.1 * np.sin(2 * np.pi * t / 12) + rng.normal(0, level * 0.05, n_months)
+        series.append(pd.Series(values, index=index))
+    return series
+
+
+async def fit_all(pool, series, order, timeout):
+    return await asyncio.gather(*(pool.run(fit_arima, ts, order, timeout=timeout) for ts in series))
+
+
+def run(categories, workers, months, order, timeout, repeats):
+    results = []
+    for n_categories in categories:
+        series = make_series(n_categories, months)
+        sequential = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for ts in series:
+                fit_arima(ts, order)
+            sequential.append(time.perf_counter() - start)
+        results.append({"categories": n_categories, "workers": 0, "mode": "sequential", "seconds": min(sequential)})
+
+        for n_workers in workers:
+            pool = FitPool(n_workers)
+            # Warm the pool so process start-up isn't attributed to the first run
+            asyncio.run(fit_all(pool, series[:n_workers], order, timeout))
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                asyncio.run(fit_all(pool, series, order, timeout))
+                timings.append(time.perf_counter() - start)
+            pool.shutdown()
+            results.append({"categories": n_categories, "workers": n_workers, "mode": "process_pool", "seconds": min(timings)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--months", type=int, default=48, help="Length of each monthly series")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-fit timeout in seconds")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    results = run(args.categories, args.workers, args.months, (1, 1, 1), args.timeout, args.repeats)
+
+    print(f"{'categories':>10} {'mode':>13} {'workers':>7} {'seconds':>9}")
+    for row in results:
+        print(f"{row['categories']:>10} {row['mode']:>13} {row['workers']:>7} {row['seconds']:>9.3f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/bench_streaming.py
+"""
+Measures time to first byte, total time and peak Python memory of /api/forecast
+answered as one JSON document and as NDJSON / Arrow IPC streams, with cold
+model fits so the streams can send early categories while later ones are still
+fitting. Also compares encoding the JSON document with FastAPI's default path
+(jsonable_encoder + json.dumps) against FastJSONResponse.
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming --rows 100000 --categories 24
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.synthetic import make_sales_rows
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from forecast_cache import ForecastCache
+    from forecast_responses import FastJSONResponse, arrow_stream_available
+    from model_store import FittedModelStore
+    from sales_data import normalize_sales_frame
+
+
+def _best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def _post(path, query, payload):
+    """Calls the ASGI app directly and records when the first and last body bytes are sent."""
+    body = json.dumps(payload).encode()
+    timings = {"first_byte_seconds": None, "bytes": 0}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait() # the client never disconnects
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            if timings["first_byte_seconds"] is None:
+                timings["first_byte_seconds"] = time.perf_counter() - start
+            timings["bytes"] += len(message["body"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "server": ("bench", 80), "client": ("bench", 1),
+    }
+    start = time.perf_counter()
+    await main.app(scope, receive, send)
+    timings["total_seconds"] = time.perf_counter() - start
+    return timings
+
+
+def _cold_request(query, months):
+    # Fresh caches so every run refits its models
+    main.FORECAST_CACHE = ForecastCache(max_entries=0)
+    main.PREDICTION_MODELS = FittedModelStore()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(_post("/api/forecast", query, {"months": months}))
+
+
+def run(n_rows, n_categories, months, repeats):
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.supabase_backend = None
+        main._install_sales_data(normalize_sales_frame(make_sales_rows(rows=n_rows, categories=n_categories, years=8)))
+    main.app.dependency_overrides[main.get_current_sales_person] = lambda: None
+
+    modes = {"json": "", "ndjson": "stream=ndjson"}
+    if arrow_stream_available():
+        modes["arrow"] = "stream=arrow"
+
+    results = {"rows": n_rows, "categories": n_categories, "modes": {}}
+    for mode, query in modes.items():
+        runs = [_cold_request(query, months) for _ in range(repeats)]
+        tracemalloc.start()
+        _cold_request(query, months)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["modes"][mode] = {
+            "first_byte_seconds": min(r["first_byte_seconds"] for r in runs),
+            "total_seconds": min(r["total_seconds"] for r in runs),
+            "bytes": runs[0]["bytes"],
+            "peak_bytes": peak,
+        }
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        payload = {"status": "success", "data": asyncio.run(main.generate_forecast_data(months))}
+    results["encode"] = {
+        "records": len(payload["data"]),
+        "default_seconds": _best_of(lambda: JSONResponse(jsonable_encoder(payload)), repeats),
+        "fast_seconds": _best_of(lambda: FastJSONResponse(payload), repeats),
+    }
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--categories", type=int, default=24)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Optional path to write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.categories, args.months, args.repeats)
+    print(f"rows={results['rows']} categories={results['categories']}")
+    for mode, timing in results["modes"].items():
+        print(f"  {mode:<7} first byte {timing['first_byte_seconds'] * 1000:8.1f} ms   total {timing['total_seconds'] * 1000:8.1f} ms   "
+              f"{timing['bytes'] / 1e3:8.1f} kB   peak {timing['peak_bytes'] / 1e6:6.2f} MB")
+    encode = results["encode"]
+    print(f"  encode {encode['records']} records: jsonable_encoder+json {encode['default_seconds'] * 1000:.1f} ms   "
+          f"FastJSONResponse {encode['fast_seconds'] * 1000:.1f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,336 @@
+# benchmarks/bench_suite.py
+"""
+End-to-end benchmark of the forecasting API on synthetic data, for comparing
+runs across changes.
+
+Generates 'sales_raw_data' at the requested scale and serves it through the
+in-memory Supabase stand-in (supabase_stub), then measures:
+  - the data load (fetch_data_from_supabase) and its stages
+  - per-endpoint request latency through the ASGI app with cold models (no
+    forecast cache, empty model store), warm models and cached forecasts
+  - latency and throughput of a mixed request load at each concurrency level,
+    with warm models and the forecast cache off
+  - the time spent per stage (forecast_stage_seconds) in every phase, summed
+    over spans; spans of concurrent work (e.g. per-category fits) overlap
+  - peak traced Python memory of the load and of the largest concurrent burst,
+    and the peak RSS of the process and of its fit workers
+
+Results are written as JSON (--output): run metadata plus a flat "metrics"
+mapping, so two runs can be compared with --compare.
+
+Run from the repository root:
+    python -m benchmarks.bench_suite --rows 100000 --concurrency 1 8 32 --output before.json
+    python -m benchmarks.bench_suite --rows 100000 --concurrency 1 8 32 --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.synthetic import make_sales_rows
+
+
+def _percentiles(timings):
+    values = np.asarray(timings, dtype='float64')
+    return {
+        "p50_seconds": float(np.percentile(values, 50)),
+        "p95_seconds": float(np.percentile(values, 95)),
+        "max_seconds": float(values.max()),
+        "mean_seconds": float(values.mean()),
+    }
+
+
+def _import_app(args):
+    """Imports main with the configuration of this run (it reads its settings at import time)."""
+    os.environ["FORECAST_ORDER_CRITERION"] = "off" # background order searches would make runs differ
+    os.environ["FORECAST_ENGINE"] = args.engine
+    os.environ["SALES_DATA_PAGE_SIZE"] = str(args.page_size)
+    os.environ["SALES_DATA_FETCH_CONCURRENCY"] = str(args.fetch_concurrency)
+    if args.fit_workers is not None:
+        os.environ["FORECAST_FIT_WORKERS"] = str(args.fit_workers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        main = importlib.import_module("main")
+        instrumentation = importlib.import_module("instrumentation")
+        supabase_stub = importlib.import_module("supabase_stub")
+    return main, instrumentation, supabase_stub
+
+
+class _StageTimer:
+    """Stage time recorded by instrumentation.span between start() and stop()."""
+
+    def __init__(self, instrumentation):
+        self.histogram = instrumentation.STAGE_SECONDS
+        self._before = {}
+
+    def start(self):
+        self._before = self.histogram.totals()
+
+    def stop(self):
+        stages = {}
+        for (stage,), (count, total) in sorted(self.histogram.totals().items()):
+            before_count, before_total = self._before.get((stage,), (0, 0.0))
+            if count > before_count:
+                stages[stage] = {"count": count - before_count, "seconds": total - before_total}
+        return stages
+
+
+def _request_mix(main, snapshot):
+    """(name, method, path, params or JSON body, sales person) for every kind of request the dashboard makes."""
+    region = main._dimension_values(snapshot, "region")[0]
+    sales_person = str(sorted(snapshot.frame["sales_person"].unique())[0])
+    return [
+        ("forecast", "POST", "/api/forecast", {"months": 6}, None),
+        ("forecast_sales_person", "POST", "/api/forecast", {"months": 6}, sales_person),
+        ("forecast_by_dimension", "POST", "/api/forecast-by-dimension", {"months": 6, "dimension": "region", "filter_value": region}, None),
+        ("forecast_batch", "POST", "/api/forecast-by-dimension/batch", {"months": 6, "dimension": "region", "values": "all"}, None),
+        ("unique_values", "GET", "/api/dimensions/unique-values", {"dimension": "region"}, None),
+    ]
+
+
+async def _send(client, request):
+    _, method, path, payload, sales_person = request
+    headers = {"x-bench-sales-person": sales_person} if sales_person else {}
+    start = time.perf_counter()
+    if method == "GET":
+        response = await client.get(path, params=payload, headers=headers)
+    else:
+        response = await client.post(path, json=payload, headers=headers)
+    seconds = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+    return seconds
+
+
+async def _run(args, main, instrumentation, supabase_stub):
+    import httpx
+    from fastapi import Header
+    from forecast_cache import ForecastCache
+    from model_store import FittedModelStore
+
+    rows = make_sales_rows(
+        rows=args.rows, categories=args.categories, sales_people=args.sales_people,
+        dimension_cardinality=args.dimension_cardinality, years=args.years, seed=args.seed,
+    )
+    main.supabase_backend = supabase_stub.AsyncStubSupabaseClient({"sales_raw_data": rows}, latency_seconds=args.page_latency_ms / 1000)
+
+    # Requests pick their sales person with a header instead of a Supabase token
+    async def bench_sales_person(x_bench_sales_person: str = Header(None)):
+        return x_bench_sales_person
+    main.app.dependency_overrides[main.get_current_sales_person] = bench_sales_person
+
+    stages = _StageTimer(instrumentation)
+    metrics = {}
+    phase_stages = {}
+
+    # --- Data load ---
+    stages.start()
+    start = time.perf_counter()
+    await main.fetch_data_from_supabase(full_reload=True)
+    metrics["load.seconds"] = time.perf_counter() - start
+    phase_stages["load"] = stages.stop()
+    snapshot = main.SALES_SNAPSHOT
+    metrics["load.rows_per_second"] = len(snapshot) / metrics["load.seconds"]
+    requests = _request_mix(main, snapshot)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # --- Per-endpoint latency: cold models, warm models, cached forecasts ---
+        for phase in ("cold", "warm", "cached"):
+            if phase != "cold":
+                # Unmeasured pass so every request of the mix finds its models (and cached forecast)
+                for request in requests:
+                    await _send(client, request)
+            stages.start()
+            for request in requests:
+                timings = []
+                for _ in range(args.repeats):
+                    if phase == "cold":
+                        main.PREDICTION_MODELS = FittedModelStore()
+                    if phase != "cached":
+                        main.FORECAST_CACHE.invalidate()
+                    timings.append(await _send(client, request))
+                for name, value in _percentiles(timings).items():
+                    metrics[f"request.{request[0]}.{phase}.{name}"] = value
+            phase_stages[f"requests_{phase}"] = stages.stop()
+
+        # --- Concurrent mixed load with warm models and no forecast cache ---
+        main.FORECAST_CACHE = ForecastCache(max_entries=0)
+
+        async def burst(concurrency, n_requests):
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one(i):
+                async with semaphore:
+                    return await _send(client, requests[i % len(requests)])
+            start = time.perf_counter()
+            timings = await asyncio.gather(*(one(i) for i in range(n_requests)))
+            return timings, time.perf_counter() - start
+
+        for concurrency in args.concurrency:
+            n_requests = max(args.requests_per_level, concurrency)
+            stages.start()
+            timings, wall_seconds = await burst(concurrency, n_requests)
+            phase_stages[f"concurrent_{concurrency}"] = stages.stop()
+            metrics[f"concurrent.{concurrency}.throughput_rps"] = n_requests / wall_seconds
+            for name, value in _percentiles(timings).items():
+                metrics[f"concurrent.{concurrency}.{name}"] = value
+
+        # --- Peak memory (separate passes: tracing slows everything down) ---
+        if not args.skip_memory:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            await main.fetch_data_from_supabase(full_reload=True)
+            metrics["memory.load_peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            await burst(max(args.concurrency), max(args.requests_per_level, max(args.concurrency)))
+            metrics["memory.concurrent_peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    metrics["memory.peak_rss_bytes"] = _max_rss_bytes(resource.RUSAGE_SELF)
+    metrics["memory.fit_workers_peak_rss_bytes"] = _max_rss_bytes(resource.RUSAGE_CHILDREN)
+    for phase, phase_stage in phase_stages.items():
+        for stage, totals in phase_stage.items():
+            metrics[f"stage.{phase}.{stage}.seconds"] = totals["seconds"]
+            metrics[f"stage.{phase}.{stage}.count"] = totals["count"]
+    return metrics
+
+
+def _max_rss_bytes(who):
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS; for children it is the largest single child
+    max_rss = resource.getrusage(who).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _metadata(args):
+    versions = {}
+    for package in ("pandas", "numpy", "statsmodels", "fastapi"):
+        try:
+            versions[package] = importlib.import_module(package).__version__
+        except Exception:
+            versions[package] = None
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+    }
+
+
+def _higher_is_better(name):
+    return name.endswith(("throughput_rps", "rows_per_second"))
+
+
+def compare(current, baseline, threshold):
+    """Rows of (metric, baseline, current, change) for timing/memory metrics, plus the regressions beyond `threshold`."""
+    rows, regressions = [], []
+    for name, value in current["metrics"].items():
+        before = baseline["metrics"].get(name)
+        if before is None or name.endswith(".count") or not before:
+            continue
+        change = value / before - 1
+        rows.append((name, before, value, change))
+        worse = -change if _higher_is_better(name) else change
+        if worse > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _format_metric(name, value):
+    if name.endswith("_bytes"):
+        return f"{value / 1e6:10.2f} MB"
+    if name.endswith("seconds"):
+        return f"{value * 1000:10.2f} ms"
+    return f"{value:13.2f}"
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    scale = parser.add_argument_group("synthetic data")
+    scale.add_argument("--rows", type=int, default=100_000)
+    scale.add_argument("--categories", type=int, default=8)
+    scale.add_argument("--sales-people", type=int, default=10)
+    scale.add_argument("--dimension-cardinality", type=int, default=12)
+    scale.add_argument("--years", type=float, default=4.0)
+    scale.add_argument("--seed", type=int, default=0)
+    scale.add_argument("--page-size", type=int, default=1000)
+    scale.add_argument("--page-latency-ms", type=float, default=0.0, help="Simulated Supabase round trip per query")
+    scale.add_argument("--fetch-concurrency", type=int, default=4, help="SALES_DATA_FETCH_CONCURRENCY")
+    load = parser.add_argument_group("load")
+    load.add_argument("--engine", default="arima", help="Forecasting engine (FORECAST_ENGINE)")
+    load.add_argument("--fit-workers", type=int, help="FORECAST_FIT_WORKERS (default: the app's default)")
+    load.add_argument("--repeats", type=int, default=3, help="Sequential requests per endpoint and phase")
+    load.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    load.add_argument("--requests-per-level", type=int, default=64)
+    load.add_argument("--skip-memory", action="store_true", help="Skip the tracemalloc passes")
+    parser.add_argument("--output", help="Path to write the results as JSON")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Relative change reported as a regression (cold ARIMA fits alone vary by ~10-20%% between runs)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when a metric regressed")
+    args = parser.parse_args()
+
+    # Set before the fit pool forks so its workers don't print statsmodels' convergence warnings either
+    warnings.simplefilter("ignore")
+    main, instrumentation, supabase_stub = _import_app(args)
+    metadata = _metadata(args)
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics = asyncio.run(_run(args, main, instrumentation, supabase_stub))
+    main.FIT_POOL.shutdown()
+    main.ORDER_SEARCH_POOL.shutdown()
+    results = {"metadata": metadata, "metrics": metrics}
+
+    print(f"rows={args.rows} categories={args.categories} sales_people={args.sales_people} "
+          f"dimension_cardinality={args.dimension_cardinality} years={args.years} engine={args.engine}")
+    for name, value in metrics.items():
+        if not name.startswith("stage.") or name.endswith(".seconds"):
+            print(f"  {name:<58} {_format_metric(name, value)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.threshold)
+        print(f"\ncompared with {args.compare} (revision {baseline['metadata'].get('git_revision')}):")
+        ignored = ("threshold", "fail_on_regression", "skip_memory")
+        changed = sorted(
+            key for key, value in metadata["config"].items()
+            if key not in ignored and baseline["metadata"].get("config", {}).get(key) != value
+        )
+        if changed:
+            print(f"  note: the runs differ in {', '.join(changed)}, so the numbers are not directly comparable")
+        for name, before, value, change in rows:
+            flag = "  REGRESSION" if name in regressions else ""
+            print(f"  {name:<58} {_format_metric(name, before)} -> {_format_metric(name, value)} {change * 100:+7.1f}%{flag}")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold * 100:.0f}%")
+        if regressions and args.fail_on_regression:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,54 @@
+# benchmarks/synthetic.py
+"""Synthetic 'sales_raw_data' rows shaped like the Supabase table."""
+from datetime import date
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+DIMENSION_COLUMNS: Sequence[str] = ("Region", "Product", "Channel")
+
+
+def make_sales_rows(
+    rows: int = 10_000,
+    categories: int = 8,
+    sales_people: int = 10,
+    dimension_cardinality: int = 12,
+    years: float = 4.0,
+    end: date = date(2026, 9, 30),
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Returns `rows` row dicts with an increasing 'id', a 'Date' string, 'Category',
+    'Sales Person', one column per DIMENSION_COLUMNS entry and a 'Revenue' value.
+    Revenue follows a per-category trend with yearly seasonality so the ARIMA fits
+    have something to find.
+    """
+    rng = np.random.default_rng(seed)
+    end_ts = pd.Timestamp(end)
+    start_ts = end_ts - pd.DateOffset(days=int(365 * years))
+    span_days = (end_ts - start_ts).days
+
+    offsets = rng.integers(0, span_days + 1, size=rows)
+    dates = start_ts + pd.to_timedelta(offsets, unit='D')
+    category_codes = rng.integers(0, categories, size=rows)
+    person_codes = rng.integers(0, sales_people, size=rows)
+
+    base = rng.uniform(50, 500, size=categories)[category_codes]
+    trend = 1 + 0.3 * offsets / max(span_days, 1)
+    season = 1 + 0.2 * np.sin(2 * np.pi * dates.month.to_numpy() / 12)
+    revenue = np.round(base * trend * season * rng.lognormal(0, 0.25, size=rows), 2)
+
+    columns: Dict[str, Any] = {
+        "id": np.arange(1, rows + 1),
+        "Date": dates.strftime('%Y-%m-%d'),
+        "Category": np.array([f"Category {i}" for i in range(categories)])[category_codes],
+        "Sales Person": np.array([f"Sales Person {i}" for i in range(sales_people)])[person_codes],
+        "Revenue": revenue,
+    }
+    for column in DIMENSION_COLUMNS:
+        values = np.array([f"{column} {i}" for i in range(dimension_cardinality)])
+        columns[column] = values[rng.integers(0, dimension_cardinality, size=rows)]
+
+    return pd.DataFrame(columns).to_dict('records')
@@ -0,0 +1,88 @@
+# column_index.py
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def encode_categorical_columns(sales_df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """
+    Dictionary-encodes the given text columns as pandas Categorical, so each row
+    holds a small integer code instead of its own Python string. Columns holding
+    unhashable values (jsonb objects or arrays) are left as they are, unindexed.
+    """
+    for col in columns:
+        if col in sales_df.columns and not isinstance(sales_df[col].dtype, pd.CategoricalDtype):
+            try:
+                sales_df[col] = sales_df[col].astype('category')
+            except TypeError as e:
+                print(f"Warning: Column '{col}' can't be dictionary-encoded ({e}), filters on it scan the rows.")
+    return sales_df
+
+
+class ColumnIndex:
+    """
+    Lookup index over one Categorical column. Labels are normalized (lower-cased)
+    once per dictionary entry instead of once per row, and every normalized value
+    maps to the sorted row positions holding it, so an equality filter becomes a
+    dictionary lookup.
+    """
+
+    def __init__(self, column: pd.Series):
+        codes = column.cat.codes.to_numpy()
+        labels = [str(label) for label in column.cat.categories]
+
+        # Several raw labels ('Bob', 'BOB') can share one normalized value
+        normalized_labels: List[str] = []
+        self.lookup: Dict[str, int] = {}
+        label_to_normalized = np.empty(len(labels) + 1, dtype='int32')
+        for i, label in enumerate(labels):
+            key = label.lower()
+            if key not in self.lookup:
+                self.lookup[key] = len(normalized_labels)
+                normalized_labels.append(key)
+            label_to_normalized[i] = self.lookup[key]
+        label_to_normalized[-1] = -1 # code -1 (missing value) stays -1
+        self.labels = normalized_labels
+
+        # Per-row code into self.labels, -1 for missing values
+        self.codes = label_to_normalized[codes].astype('int32')
+
+        position_dtype = 'int32' if len(codes) < np.iinfo('int32').max else 'int64'
+        order = np.argsort(self.codes, kind='stable').astype(position_dtype)
+        sorted_codes = self.codes[order]
+        boundaries = np.searchsorted(sorted_codes, np.arange(len(normalized_labels) + 1))
+        self._positions = [order[boundaries[i]:boundaries[i + 1]] for i in range(len(normalized_labels))]
+        for positions in self._positions:
+            positions.flags.writeable = False
+
+    def positions(self, value: str) -> np.ndarray:
+        """Sorted row positions whose value equals `value`, ignoring case."""
+        code = self.lookup.get(str(value).lower())
+        if code is None:
+            return np.empty(0, dtype='int64')
+        return self._positions[code]
+
+    def row_count(self, value: str) -> int:
+        return len(self.positions(value))
+
+    def unique_values(self, positions: Optional[np.ndarray] = None) -> List[str]:
+        """
+        Sorted distinct values (stripped and lower-cased) present in the column,
+        optionally restricted to the given row positions.
+        """
+        if positions is None:
+            present = [i for i, rows in enumerate(self._positions) if len(rows)]
+        else:
+            present = np.unique(self.codes[positions])
+            present = present[present >= 0]
+        return sorted({self.labels[i].strip() for i in present})
+
+
+def build_column_indexes(sales_df: pd.DataFrame) -> Dict[str, ColumnIndex]:
+    """Builds a ColumnIndex for every Categorical column of the frame."""
+    return {
+        col: ColumnIndex(sales_df[col])
+        for col in sales_df.columns
+        if isinstance(sales_df[col].dtype, pd.CategoricalDtype)
+    }
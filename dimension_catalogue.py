@@ -0,0 +1,186 @@
+# dimension_catalogue.py
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from column_index import ColumnIndex
+
+
+class DimensionValues:
+    """
+    Distinct values of one dimension (overall or for one sales person), sorted, with
+    the number of rows and the first and last date of every value. Rows point into
+    the dimension's shared sorted value list, so a prefix search is a binary search.
+    """
+
+    def __init__(
+        self,
+        all_values: List[str],
+        ids: np.ndarray,
+        row_counts: np.ndarray,
+        first_dates: np.ndarray,
+        last_dates: np.ndarray,
+    ):
+        self.all_values = all_values
+        self.ids = ids
+        self.row_counts = row_counts
+        self.first_dates = first_dates
+        self.last_dates = last_dates
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, prefix: Optional[str] = None, offset: int = 0, limit: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        Positions of the values starting with `prefix` (normalized like the values),
+        paginated by offset/limit, and the number of matching values.
+        """
+        start, end = 0, len(self.ids)
+        if prefix:
+            prefix = prefix.strip().lower()
+            # The values sharing the prefix form one contiguous run of the sorted list
+            lo = bisect_left(self.all_values, prefix)
+            hi = bisect_left(self.all_values, prefix + '\U0010ffff', lo)
+            start, end = np.searchsorted(self.ids, [lo, hi])
+        total = int(end - start)
+        first = start + min(max(offset, 0), total)
+        last = end if limit is None else min(end, first + max(limit, 0))
+        return np.arange(first, last), total
+
+    def values(self, positions: Optional[np.ndarray] = None) -> List[str]:
+        ids = self.ids if positions is None else self.ids[positions]
+        return [self.all_values[i] for i in ids.tolist()]
+
+    def details(self, positions: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Per value: 'value', 'row_count', 'first_date' and 'last_date' (YYYY-MM-DD, None without dates)."""
+        if positions is None:
+            positions = np.arange(len(self.ids))
+        first_dates = pd.DatetimeIndex(self.first_dates[positions]).strftime('%Y-%m-%d')
+        last_dates = pd.DatetimeIndex(self.last_dates[positions]).strftime('%Y-%m-%d')
+        return [
+            {
+                "value": value,
+                "row_count": row_count,
+                # NaT formats as NaN
+                "first_date": first_date if isinstance(first_date, str) else None,
+                "last_date": last_date if isinstance(last_date, str) else None,
+            }
+            for value, row_count, first_date, last_date in zip(
+                self.values(positions), self.row_counts[positions].tolist(), first_dates, last_dates
+            )
+        ]
+
+
+class _DimensionEntry:
+    """The catalogue of one dimension: overall values and values per sales person code."""
+
+    def __init__(self, overall: DimensionValues, by_sales_person: Dict[int, DimensionValues]):
+        self.overall = overall
+        self.by_sales_person = by_sales_person
+
+
+def _normalized_codes(labels: Sequence[str], codes: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """
+    Maps per-row codes into `labels` (-1 for missing) to codes into the sorted list of
+    distinct stripped, lower-cased labels, which it returns alongside.
+    """
+    normalized = np.array([str(label).strip().lower() for label in labels], dtype=object)
+    ranks, sorted_values = pd.factorize(normalized, sort=True)
+    label_to_id = np.append(ranks.astype('int64'), -1)
+    return sorted_values.tolist(), label_to_id[codes]
+
+
+def _build_entry(
+    value_ids: np.ndarray,
+    sorted_values: List[str],
+    dates: np.ndarray,
+    sales_person_codes: Optional[np.ndarray],
+) -> _DimensionEntry:
+    present = value_ids >= 0
+    rows = pd.DataFrame({'value': value_ids[present], 'date': dates[present]})
+
+    overall = rows.groupby('value', sort=True)['date'].agg(['size', 'min', 'max'])
+    overall_values = DimensionValues(
+        sorted_values,
+        overall.index.to_numpy(dtype='int64'),
+        overall['size'].to_numpy(dtype='int64'),
+        overall['min'].to_numpy(dtype='datetime64[ns]'),
+        overall['max'].to_numpy(dtype='datetime64[ns]'),
+    )
+
+    by_sales_person: Dict[int, DimensionValues] = {}
+    if sales_person_codes is not None:
+        rows['sales_person'] = sales_person_codes[present]
+        rows = rows[rows['sales_person'] >= 0]
+        grouped = rows.groupby(['sales_person', 'value'], sort=True)['date'].agg(['size', 'min', 'max'])
+        person = grouped.index.get_level_values(0).to_numpy(dtype='int64')
+        ids = grouped.index.get_level_values(1).to_numpy(dtype='int64')
+        counts = grouped['size'].to_numpy(dtype='int64')
+        first_dates = grouped['min'].to_numpy(dtype='datetime64[ns]')
+        last_dates = grouped['max'].to_numpy(dtype='datetime64[ns]')
+        # Rows are sorted by sales person, so each one's values are a contiguous slice
+        boundaries = np.flatnonzero(np.diff(person)) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(person)]):
+            by_sales_person[int(person[start])] = DimensionValues(
+                sorted_values, ids[start:end], counts[start:end], first_dates[start:end], last_dates[start:end]
+            )
+    return _DimensionEntry(overall_values, by_sales_person)
+
+
+class DimensionCatalogue:
+    """
+    Sorted distinct normalized values of the dimension columns, overall and per sales
+    person, with row counts and date ranges, for /api/dimensions/unique-values.
+
+    Every column (or the given `columns`) is catalogued up front, when the snapshot is
+    built in a worker thread, so requests only read it. Columns with a ColumnIndex reuse
+    its codes; the others are factorized once.
+    """
+
+    def __init__(self, frame: pd.DataFrame, indexes: Dict[str, ColumnIndex], columns: Optional[Sequence[str]] = None):
+        self.frame = frame
+        self.indexes = indexes
+        self._entries: Dict[str, _DimensionEntry] = {}
+        self._dates = (
+            frame['date'].to_numpy(dtype='datetime64[ns]') if 'date' in frame.columns
+            else np.full(len(frame), np.datetime64('NaT'), dtype='datetime64[ns]')
+        )
+        self._sales_person_index = indexes.get('sales_person')
+        for column in (frame.columns if columns is None else columns):
+            if column in frame.columns:
+                self._entries[column] = self._build(column)
+
+    def _build(self, column: str) -> _DimensionEntry:
+        column_index = self.indexes.get(column)
+        if column_index is not None:
+            sorted_values, value_ids = _normalized_codes(column_index.labels, column_index.codes)
+        else:
+            values = self.frame[column]
+            try:
+                codes, labels = pd.factorize(values, use_na_sentinel=True)
+            except TypeError:
+                # Unhashable values (lists or dicts from array/jsonb columns) are catalogued by their text
+                values = values.astype(object)
+                codes, labels = pd.factorize(values.astype(str).where(values.notna()), use_na_sentinel=True)
+            sorted_values, value_ids = _normalized_codes([str(label) for label in labels], codes)
+        sales_person_codes = self._sales_person_index.codes if self._sales_person_index is not None else None
+        return _build_entry(value_ids, sorted_values, self._dates, sales_person_codes)
+
+    def dimension(self, column: str, sales_person: Optional[str] = None) -> Optional[DimensionValues]:
+        """
+        The values of `column`, restricted to the rows of `sales_person` (ignoring case)
+        when given. None when the column isn't catalogued or the sales person has no rows;
+        the filter is ignored when the data has no 'sales_person' column.
+        """
+        entry = self._entries.get(column)
+        if entry is None:
+            return None
+        if not sales_person or self._sales_person_index is None:
+            return entry.overall
+        code = self._sales_person_index.lookup.get(str(sales_person).lower())
+        return entry.by_sales_person.get(code) if code is not None else None
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._entries
@@ -0,0 +1,119 @@
+# fit_pool.py
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+
+class FitPool:
+    """
+    Process pool for model fits that never has more fits submitted than it has workers.
+
+    A fit waits for a free worker slot before it is submitted, so its timeout only covers
+    the fit itself and not the time spent queued behind other fits. A fit that times out
+    can't be interrupted inside its worker, so the pool is retired instead: its workers
+    are terminated (in a worker thread, off the event loop) and the next fit starts a
+    fresh pool. Fits that were still running on the retired pool are submitted once more
+    to the new one. shutdown() terminates the workers the same way, without resubmitting
+    their fits, so a stuck fit can't hold up process exit.
+
+    With `workers` <= 0 fits run on the event loop's default thread pool (useful when
+    debugging); a timed-out fit then keeps running in its thread.
+    """
+
+    def __init__(self, workers: int, name: str = 'fit'):
+        self.workers = int(workers)
+        self.name = name
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.fits = 0
+        self.timeouts = 0
+        self.recycles = 0
+        self._shutdowns = 0
+
+    @property
+    def slots(self) -> int:
+        if self.workers > 0:
+            return self.workers
+        # The default thread pool's size
+        return min(32, (os.cpu_count() or 1) + 4)
+
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        """The current process pool (created on first use), or None for the default thread pool."""
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to the event loop it first waited on
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.slots)
+            self._slots_loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Runs fn(*args) on the pool once a worker slot is free. Raises asyncio.TimeoutError
+        when it takes longer than `timeout` seconds after being submitted.
+        """
+        loop = asyncio.get_running_loop()
+        shutdowns = self._shutdowns
+        async with self._semaphore():
+            for attempt in range(2):
+                executor = self.executor()
+                try:
+                    result = await asyncio.wait_for(loop.run_in_executor(executor, fn, *args), timeout=timeout)
+                    self.fits += 1
+                    return result
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    await self.retire(executor)
+                    raise
+                except BrokenProcessPool:
+                    if executor is self._executor:
+                        # A worker died (e.g. OOM-killed); start a fresh pool for the next fit
+                        self._executor = None
+                        raise
+                    if attempt or self._shutdowns != shutdowns:
+                        raise
+                    # The pool was retired under this fit (another fit timed out); run it again
+
+    async def retire(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        """Terminates the workers of `executor` if it is still the current pool; the next fit starts a new one."""
+        if executor is None or executor is not self._executor:
+            return
+        self._executor = None
+        self.recycles += 1
+        await asyncio.to_thread(self._terminate, executor)
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor) -> None:
+        terminate_workers = getattr(executor, 'terminate_workers', None)
+        if terminate_workers is not None:
+            terminate_workers() # Python 3.14+
+        else:
+            # Older versions have no public way to stop a worker in the middle of a fit
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.terminate()
+        # The pool notices right away that its workers are gone, so this only waits for its cleanup
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stops the pool without waiting for running fits (blocking; call it off the event loop)."""
+        executor, self._executor = self._executor, None
+        self._shutdowns += 1
+        if executor is not None:
+            self._terminate(executor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "fits": self.fits,
+            "timeouts": self.timeouts,
+            "recycles": self.recycles,
+        }
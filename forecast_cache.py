@@ -0,0 +1,86 @@
+# forecast_cache.py
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+ForecastCacheKey = Tuple[Hashable, ...]
+
+
+class ForecastCache:
+    """
+    Size-bounded LRU cache for the payloads produced by generate_forecast_data.
+
+    Entries are keyed by the data snapshot version plus every request parameter
+    that changes the output, so a reload of SALES_RAW_DATA can never serve a
+    stale forecast. Cached payloads are shared between requests and must be
+    treated as read-only by callers.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(0, int(max_entries))
+        self._entries: "OrderedDict[ForecastCacheKey, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(
+        data_version: Hashable,
+        sales_person: Optional[str],
+        dimension_col: Optional[str],
+        dimension_value: Optional[str],
+        months: int,
+        current_month_start: datetime,
+        engine: str = 'arima',
+    ) -> ForecastCacheKey:
+        # Normalize the filters the same way generate_forecast_data does, so
+        # 'Bob' and 'bob' (or 'Sales Person' and 'sales_person') share an entry.
+        sales_person_key = sales_person.lower() if sales_person else None
+        if dimension_col and dimension_value:
+            dimension_key = (dimension_col.strip().replace(' ', '_').lower(), dimension_value.lower())
+        else:
+            dimension_key = None
+        return (data_version, sales_person_key, dimension_key, int(months), current_month_start, engine)
+
+    def get(self, key: ForecastCacheKey) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: ForecastCacheKey, value: List[Dict[str, Any]]) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drops every entry, e.g. after SALES_RAW_DATA has been reloaded."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,96 @@
+# forecast_responses.py
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from instrumentation import span
+
+try:
+    import orjson # optional; without it responses fall back to the standard json module
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError: # pyarrow is optional; without it only the NDJSON stream is offered
+    pa = None
+    pa_ipc = None
+
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+def _dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson when it is installed. Endpoints return it directly,
+    which also skips FastAPI's jsonable_encoder pass over every record; the content must
+    therefore already consist of plain JSON types (the forecast records do).
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span('serialize'):
+            return _dumps(content)
+
+
+def arrow_stream_available() -> bool:
+    return pa is not None
+
+
+async def ndjson_chunks(record_groups: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """One JSON record per line; every group of records is sent as one chunk."""
+    async for records in record_groups:
+        if records:
+            with span('serialize'):
+                chunk = b''.join(_dumps(record) + b'\n' for record in records)
+            yield chunk
+
+
+def _arrow_schema():
+    return pa.schema([
+        ('date', pa.string()),
+        ('month', pa.string()),
+        ('category', pa.string()),
+        ('actual', pa.float64()),
+        ('forecast', pa.float64()),
+        ('is_future', pa.bool_()),
+    ])
+
+
+async def arrow_chunks(record_groups: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    An Arrow IPC stream with one record batch per group of records, each flushed as soon
+    as the group arrives (the schema message goes out with the first batch).
+    """
+    schema = _arrow_schema()
+    sink = io.BytesIO()
+    writer = pa_ipc.new_stream(sink, schema)
+
+    def flush() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    async for records in record_groups:
+        if records:
+            with span('serialize'):
+                writer.write_batch(pa.RecordBatch.from_pylist(records, schema=schema))
+            yield flush()
+    writer.close()
+    yield flush()
+
+
+def streaming_forecast_response(record_groups: AsyncIterator[List[Dict[str, Any]]], stream_format: str) -> StreamingResponse:
+    if stream_format == 'arrow':
+        return StreamingResponse(arrow_chunks(record_groups), media_type=ARROW_STREAM_MEDIA_TYPE)
+    return StreamingResponse(ndjson_chunks(record_groups), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,33 @@
+# forecast_workers.py
+# Functions executed inside the model-fitting process pool.
+# Kept separate from main.py so worker processes don't import the FastAPI app
+# or create a Supabase client when they unpickle a task.
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+
+
+def fit_arima(ts: pd.Series, order: tuple, start_params=None):
+    """
+    Fits an ARIMA model of the given order and returns the (picklable) results object.
+    `start_params` (e.g. a previous fit's params) warm-starts the optimizer.
+    """
+    return ARIMA(ts, order=order).fit(start_params=start_params)
+
+
+def append_arima(model_fit, new_observations: pd.Series):
+    """
+    Extends a fitted model with observations that follow its data, keeping the
+    estimated parameters; only the Kalman filter runs again, no optimization.
+    """
+    return model_fit.append(new_observations, refit=False)
+
+
+def score_arima_order(ts: pd.Series, order: tuple, criterion: str = 'aic') -> float:
+    """AIC or BIC of an ARIMA fit of the given order; inf when the fit fails."""
+    try:
+        model_fit = fit_arima(ts, order)
+        score = float(getattr(model_fit, criterion))
+    except Exception:
+        return float('inf')
+    return score if np.isfinite(score) else float('inf')
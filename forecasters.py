@@ -0,0 +1,178 @@
+# forecasters.py
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import span
+
+
+CategorySeries = List[Tuple[str, pd.Series]]
+
+
+def training_history(ts_for_training: pd.Series, current_month_start: datetime) -> Optional[pd.Series]:
+    """
+    The part of a category's monthly series a forecast is trained on (the months before
+    the current one), or None when it is too short (less than 3 points) or all zeros.
+    """
+    ts_actual_historical = ts_for_training[ts_for_training.index < current_month_start]
+    if len(ts_actual_historical) < 3 or ts_actual_historical.sum() == 0:
+        return None
+    return ts_actual_historical
+
+
+def failed_forecast(forecast_dates: pd.DatetimeIndex) -> pd.Series:
+    """
+    The NaN forecast of a category whose fit failed or timed out. Unlike the NaNs of a
+    category with too little history it is flagged, so the result isn't cached.
+    """
+    forecast_series = pd.Series(np.nan, index=forecast_dates)
+    forecast_series.attrs['failed'] = True
+    return forecast_series
+
+
+def forecast_failed(forecast_series: pd.Series) -> bool:
+    return bool(forecast_series.attrs.get('failed', False))
+
+
+class Forecaster:
+    """
+    A forecasting engine. forecast() returns, for every (category, monthly series) pair,
+    a series of `months` values indexed from the current month; categories that can't be
+    forecast get NaNs, and categories whose fit failed get a failed_forecast().
+    Engines are picked per request by name (see FORECAST_ENGINES).
+    """
+
+    name = ''
+
+    async def forecast(self, category_series: CategorySeries, months: int, current_month_start: datetime) -> List[pd.Series]:
+        raise NotImplementedError
+
+    async def forecast_each(
+        self, category_series: CategorySeries, months: int, current_month_start: datetime
+    ) -> AsyncIterator[Tuple[int, pd.Series]]:
+        """Yields (position in category_series, forecast) as forecasts become available."""
+        for i, forecast_series in enumerate(await self.forecast(category_series, months, current_month_start)):
+            yield i, forecast_series
+
+
+class PerSeriesForecaster(Forecaster):
+    """Runs an async per-category forecast function (e.g. an ARIMA fit) for all categories concurrently."""
+
+    def __init__(self, name: str, forecast_one: Callable[[str, pd.Series, int, datetime], Awaitable[pd.Series]]):
+        self.name = name
+        self.forecast_one = forecast_one
+
+    async def forecast(self, category_series: CategorySeries, months: int, current_month_start: datetime) -> List[pd.Series]:
+        return list(await asyncio.gather(*(
+            self.forecast_one(category_name, ts, months, current_month_start) for category_name, ts in category_series
+        )))
+
+    async def forecast_each(
+        self, category_series: CategorySeries, months: int, current_month_start: datetime
+    ) -> AsyncIterator[Tuple[int, pd.Series]]:
+        async def forecast_at(i: int, category_name: str, ts: pd.Series):
+            return i, await self.forecast_one(category_name, ts, months, current_month_start)
+
+        tasks = [asyncio.ensure_future(forecast_at(i, name, ts)) for i, (name, ts) in enumerate(category_series)]
+        try:
+            for next_forecast in asyncio.as_completed(tasks):
+                yield await next_forecast
+        finally:
+            # The consumer may stop early (e.g. a client disconnecting mid-stream)
+            for task in tasks:
+                task.cancel()
+
+
+def _right_aligned(histories: Sequence[pd.Series]) -> np.ndarray:
+    """Stacks series of different lengths into an (n_series x longest) array, NaN-padded on the left."""
+    values = np.full((len(histories), max(len(h) for h in histories)), np.nan)
+    for i, history in enumerate(histories):
+        values[i, values.shape[1] - len(history):] = history.to_numpy(dtype='float64')
+    return values
+
+
+def damped_holt_forecast(
+    values: np.ndarray,
+    horizon: int,
+    alphas: Sequence[float],
+    betas: Sequence[float],
+    phis: Sequence[float],
+) -> np.ndarray:
+    """
+    Damped-trend Holt exponential smoothing for many series at once.
+
+    `values` is an (n_series x T) array whose rows end in the same column and are
+    NaN-padded on the left. Every (alpha, beta, phi) combination of the grids is run
+    for every series in one pass over time on (n_params x n_series) arrays; each
+    series then keeps the combination with the smallest in-sample one-step squared
+    error. Returns an (n_series x horizon) array of forecasts following the last column.
+    """
+    grid = np.array(np.meshgrid(alphas, betas, phis, indexing='ij')).reshape(3, -1)
+    alpha, beta, phi = (grid[i][:, None] for i in range(3))
+    n_params, (n_series, n_steps) = grid.shape[1], values.shape
+
+    with span('fit', engine='holt', series=n_series):
+        level = np.zeros((n_params, n_series))
+        trend = np.zeros((n_params, n_series))
+        sse = np.zeros((n_params, n_series))
+        seen = np.zeros(n_series, dtype='int64')
+        for t in range(n_steps):
+            y = values[:, t]
+            valid = ~np.isnan(y)
+            first, second, later = valid & (seen == 0), valid & (seen == 1), valid & (seen >= 2)
+            # Initialize the level from the first point and the trend from the first difference
+            trend = np.where(second, y - level, trend)
+            level = np.where(first | second, y, level)
+
+            error = y - (level + phi * trend)
+            sse = np.where(later, sse + error ** 2, sse)
+            new_level = level + phi * trend + alpha * error
+            trend = np.where(later, phi * trend + alpha * beta * error, trend)
+            level = np.where(later, new_level, level)
+            seen += valid
+
+        best = np.argmin(sse, axis=0)
+
+    with span('predict', engine='holt', series=n_series):
+        columns = np.arange(n_series)
+        best_level, best_trend, best_phi = level[best, columns], trend[best, columns], phi[best, 0]
+        # Sum of phi^1..phi^h for every horizon step h
+        damping = np.cumsum(best_phi[:, None] ** np.arange(1, horizon + 1), axis=1)
+        return best_level[:, None] + damping * best_trend[:, None]
+
+
+class DampedHoltForecaster(Forecaster):
+    """
+    NumPy damped-trend exponential smoothing: all categories of a request are fitted
+    together as one 2-D array, in milliseconds, without a per-series optimizer.
+    """
+
+    name = 'holt'
+
+    def __init__(
+        self,
+        alphas: Sequence[float] = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9),
+        betas: Sequence[float] = (0.0, 0.05, 0.1, 0.2, 0.3),
+        phis: Sequence[float] = (0.8, 0.9, 0.98),
+    ):
+        self.alphas, self.betas, self.phis = alphas, betas, phis
+
+    def forecast_now(self, category_series: CategorySeries, months: int, current_month_start: datetime) -> List[pd.Series]:
+        forecast_dates = pd.date_range(start=current_month_start, periods=months, freq='MS')
+        histories = [training_history(ts, current_month_start) for _, ts in category_series]
+        fitted = [i for i, history in enumerate(histories) if history is not None]
+        results = [pd.Series(np.nan, index=forecast_dates) for _ in category_series]
+        if fitted and months > 0:
+            forecasts = damped_holt_forecast(
+                _right_aligned([histories[i] for i in fitted]), months, self.alphas, self.betas, self.phis
+            )
+            for row, i in enumerate(fitted):
+                # Like the ARIMA forecasts: the steps after the last training month, labelled from the current month
+                results[i] = pd.Series(forecasts[row], index=forecast_dates)
+        return results
+
+    async def forecast(self, category_series: CategorySeries, months: int, current_month_start: datetime) -> List[pd.Series]:
+        return self.forecast_now(category_series, months, current_month_start)
@@ -0,0 +1,222 @@
+# hierarchical_forecast.py
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from forecasters import CategorySeries, Forecaster, forecast_failed, training_history
+from sales_cube import MonthlyCube
+
+
+class BottomUpViewForecaster(Forecaster):
+    """
+    Forecasts one view (e.g. all data or one sales person) from the summed bottom-level
+    forecasts of its categories instead of fitting its series. Categories with too little
+    history of their own get NaNs. Categories without a complete sum (a bottom-level
+    series of the view is missing its forecast, or none is active) are forecast by
+    `fallback` from the view's own series, or get NaNs without one.
+    """
+
+    def __init__(self, name: str, category_forecasts: Dict[str, np.ndarray], fallback: Optional[Forecaster] = None):
+        self.name = name
+        self.category_forecasts = category_forecasts
+        self.fallback = fallback
+
+    async def forecast(self, category_series: CategorySeries, months: int, current_month_start: datetime) -> List[pd.Series]:
+        forecast_dates = pd.date_range(start=current_month_start, periods=months, freq='MS')
+        results: List[Optional[pd.Series]] = []
+        fallback_positions, fallback_series = [], []
+        for category_name, ts_for_training in category_series:
+            summed = self.category_forecasts.get(category_name)
+            if summed is None and self.fallback is not None:
+                fallback_positions.append(len(results))
+                fallback_series.append((category_name, ts_for_training))
+                results.append(None)
+            elif summed is None or training_history(ts_for_training, current_month_start) is None:
+                results.append(pd.Series(np.nan, index=forecast_dates))
+            else:
+                results.append(pd.Series(summed[:months], index=forecast_dates))
+        if fallback_series:
+            fallback_forecasts = await self.fallback.forecast(fallback_series, months, current_month_start)
+            for position, forecast_series in zip(fallback_positions, fallback_forecasts):
+                results[position] = forecast_series
+        return results
+
+
+class BottomUpForecasts:
+    """
+    Forecasts of every bottom-level series of one data snapshot (monthly revenue per
+    sales person x category, further split by `dimensions`), fitted once with one
+    engine `horizon` months ahead of `current_month_start`.
+
+    Every view that is a union of bottom-level series (all data, one sales person,
+    one value of a bottom-level dimension, or both) is then forecast by summing the
+    stored forecasts per category, so the views are coherent with each other and
+    serving them needs no model fitting.
+
+    Series whose last month is more than `recency_months` before the current month
+    (e.g. a sales person who left), or without any revenue before it, are stale: they
+    are neither fitted nor summed, i.e. forecast as zero. An active series that has
+    no forecast (too little history, or its fit failed or timed out) is missing, and
+    the categories it belongs to have no sum in any view containing it, so they are
+    forecast per request instead of summed without it.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        engine: str,
+        current_month_start: datetime,
+        horizon: int,
+        dimensions: Sequence[str],
+        cube: MonthlyCube,
+        node_keys: np.ndarray,
+        node_categories: np.ndarray,
+        forecasts: np.ndarray,
+        node_missing: Optional[np.ndarray] = None,
+        stale_series: int = 0,
+        build_seconds: float = 0.0,
+    ):
+        self.version = version
+        self.engine = engine
+        self.current_month_start = current_month_start
+        self.horizon = horizon
+        self.dimensions = list(dimensions)
+        self.cube = cube
+        self.node_keys = node_keys
+        self.node_categories = node_categories
+        self.forecasts = forecasts
+        self.node_missing = node_missing if node_missing is not None else np.isnan(forecasts).any(axis=1)
+        self.stale_series = stale_series
+        self.build_seconds = build_seconds
+
+    @classmethod
+    async def build(
+        cls,
+        cube: MonthlyCube,
+        forecaster: Forecaster,
+        version: int,
+        horizon: int,
+        current_month_start: datetime,
+        dimensions: Sequence[str] = (),
+        recency_months: int = 1,
+        batch_size: Optional[int] = None,
+    ) -> "BottomUpForecasts":
+        """
+        Fits every active bottom-level series. With `batch_size` the series go to the
+        engine that many at a time, so fits requested meanwhile by other callers of a
+        shared fit pool are queued between batches rather than behind all of them.
+        """
+        start = time.perf_counter()
+        dimensions = [col for col in dimensions if col in cube.dimensions]
+        group_keys, series_by_group = cube.category_series_by_groups(dimensions)
+        category_codes = {name: code for code, name in enumerate(cube.categories)}
+        active_from = pd.Timestamp(current_month_start) - pd.DateOffset(months=max(0, int(recency_months)))
+
+        node_groups, node_categories, node_series, fitted = [], [], [], []
+        stale_series = 0
+        for group, series in enumerate(series_by_group):
+            for category_name, ts_for_training in series.items():
+                history = ts_for_training[ts_for_training.index < current_month_start]
+                if ts_for_training.empty or ts_for_training.index.max() < active_from or history.sum() == 0:
+                    stale_series += 1
+                    continue
+                node_groups.append(group)
+                node_categories.append(category_codes[category_name])
+                if training_history(ts_for_training, current_month_start) is not None:
+                    fitted.append(len(node_series))
+                node_series.append((category_name, ts_for_training))
+
+        horizon = max(1, int(horizon))
+        forecasts = np.full((len(node_series), horizon), np.nan)
+        node_missing = np.ones(len(node_series), dtype=bool)
+        batch_size = max(1, int(batch_size)) if batch_size else max(1, len(fitted))
+        for batch_start in range(0, len(fitted), batch_size):
+            batch = fitted[batch_start:batch_start + batch_size]
+            batch_forecasts = await forecaster.forecast([node_series[i] for i in batch], horizon, current_month_start)
+            for i, forecast_series in zip(batch, batch_forecasts):
+                values = forecast_series.to_numpy(dtype='float64')[:horizon]
+                if forecast_failed(forecast_series) or len(values) < horizon or np.isnan(values).any():
+                    continue
+                forecasts[i] = values
+                node_missing[i] = False
+        return cls(
+            version=version,
+            engine=forecaster.name,
+            current_month_start=current_month_start,
+            horizon=horizon,
+            dimensions=dimensions,
+            cube=cube,
+            node_keys=group_keys[np.asarray(node_groups, dtype='int64')] if node_groups else group_keys[:0],
+            node_categories=np.asarray(node_categories, dtype='int64'),
+            forecasts=forecasts,
+            node_missing=node_missing,
+            stale_series=stale_series,
+            build_seconds=time.perf_counter() - start,
+        )
+
+    def __len__(self) -> int:
+        return len(self.node_categories)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "data_version": self.version,
+            "engine": self.engine,
+            "current_month": self.current_month_start.strftime('%Y-%m'),
+            "horizon": self.horizon,
+            "dimensions": self.dimensions,
+            "series": len(self),
+            "missing_series": int(self.node_missing.sum()),
+            "stale_series": self.stale_series,
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+    def is_current(self, version: int, current_month_start: datetime) -> bool:
+        return self.version == version and self.current_month_start == current_month_start
+
+    def covers(self, engine: str, months: int, dimension_col: Optional[str] = None) -> bool:
+        """True when a view of `dimension_col` (None: no dimension filter) can be summed for this request."""
+        return engine == self.engine and 0 < months <= self.horizon and (dimension_col is None or dimension_col in self.dimensions)
+
+    def category_forecasts(
+        self,
+        sales_person: Optional[str] = None,
+        dimension_col: Optional[str] = None,
+        dimension_value: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        {category: summed forecast over the view's bottom-level series} for the categories
+        the view has active series of, leaving out those with a missing series.
+        """
+        mask = np.ones(len(self.node_categories), dtype=bool)
+        if sales_person and self.cube.sales_person is not None:
+            code = self.cube.sales_person_codes.get(str(sales_person).lower())
+            if code is None:
+                return {}
+            mask &= self.node_keys[:, 0] == code
+        if dimension_col and dimension_value:
+            code = self.cube.dimension_codes[dimension_col].get(dimension_value.lower())
+            if code is None:
+                return {}
+            mask &= self.node_keys[:, 1 + self.dimensions.index(dimension_col)] == code
+
+        categories = self.node_categories[mask]
+        complete = ~np.isin(categories, categories[self.node_missing[mask]])
+        categories = categories[complete]
+        sums = np.zeros((len(self.cube.categories), self.horizon))
+        np.add.at(sums, categories, self.forecasts[mask][complete])
+        return {self.cube.categories[code]: sums[code] for code in np.unique(categories)}
+
+    def forecaster_for(
+        self,
+        sales_person: Optional[str] = None,
+        dimension_col: Optional[str] = None,
+        dimension_value: Optional[str] = None,
+        fallback: Optional[Forecaster] = None,
+    ) -> BottomUpViewForecaster:
+        """The view's forecaster; categories without a complete sum are forecast by `fallback`."""
+        return BottomUpViewForecaster(
+            f"{self.engine}:bottom_up", self.category_forecasts(sales_person, dimension_col, dimension_value), fallback
+        )
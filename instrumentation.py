@@ -0,0 +1,214 @@
+# instrumentation.py
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# LOG_LEVEL=DEBUG prints the verbose debug lines (frame heads, per-category series, span
+# timings). At any other level (INFO is the default) those messages are not even built,
+# so requests don't pay for formatting frames nobody reads. Warnings and errors always print.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+DEBUG_LOGGING = LOG_LEVEL == "DEBUG"
+
+# Seconds; covers cache hits (sub-millisecond) up to slow full ARIMA fits and Supabase reads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}", *self.samples()]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label combination."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(v)}" for key, v in values]
+
+
+class Gauge(_Metric):
+    """A value read from `function` whenever the metrics are rendered (e.g. a cache size)."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, function: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.function = function
+
+    def samples(self) -> List[str]:
+        try:
+            return [f"{self.name} {_format_value(self.function())}"]
+        except Exception as e:
+            print(f"Warning: Could not read gauge {self.name}: {e}")
+            return []
+
+
+class Histogram(_Metric):
+    """Observations (durations, in seconds) counted into cumulative buckets per label combination."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [count per bucket (+ one for +Inf)], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._label_values(labels))
+            return sum(entry[0]) if entry else 0
+
+    def totals(self) -> Dict[LabelValues, Tuple[int, float]]:
+        """(observation count, sum) per label combination, e.g. to diff before and after a run."""
+        with self._lock:
+            return {key: (sum(counts), total[0]) for key, (counts, total) in self._values.items()}
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics served by /metrics, rendered in the Prometheus text exposition format."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, function: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, documentation, function))
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+# One observation per span: per request for filter/resample/assemble/serialize, per
+# category for ARIMA fit/predict, per load for fetch/normalize/build_snapshot, per fit of the
+# hierarchical forecasts for hierarchy_fit
+STAGE_SECONDS = METRICS.histogram(
+    "forecast_stage_seconds",
+    "Duration of the stages of loading data and answering forecast requests.",
+    ("stage",),
+)
+
+
+@contextmanager
+def span(stage: str, **fields) -> Iterator[None]:
+    """
+    Times the enclosed block into forecast_stage_seconds{stage=...}. With LOG_LEVEL=DEBUG
+    it also prints one line per span with `fields` (e.g. category=...) as key=value pairs.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_SECONDS.observe(seconds, stage=stage)
+        if DEBUG_LOGGING:
+            details = "".join(f" {key}={value}" for key, value in fields.items())
+            print(f"DEBUG: span stage={stage} seconds={seconds:.6f}{details}")
@@ -104,11 +104,21 @@ export async function fetchForecastByDimension(
 }
 
 // REMOVE 'accessToken' parameter from these function signatures
-export async function fetchUniqueDimensionValues(dimension: string): Promise<string[]> {
+// `prefix` narrows the values to those starting with it (ignoring case); `offset` and
+// `limit` page through them, for dimensions with too many values for one dropdown.
+export async function fetchUniqueDimensionValues(
+  dimension: string,
+  options: { prefix?: string; offset?: number; limit?: number } = {}
+): Promise<{ values: string[]; total: number }> {
   try {
     const headers = await getAuthHeaders(); // Get headers with auth token
 
-    const response = await fetch(`http://localhost:8000/api/dimensions/unique-values?dimension=${encodeURIComponent(dimension)}`, {
+    const params = new URLSearchParams({ dimension });
+    if (options.prefix) params.set("prefix", options.prefix);
+    if (options.offset !== undefined) params.set("offset", String(options.offset));
+    if (options.limit !== undefined) params.set("limit", String(options.limit));
+
+    const response = await fetch(`http://localhost:8000/api/dimensions/unique-values?${params.toString()}`, {
       method: "GET", // This is a GET request
       headers: headers, // Use the headers with authentication
     });
@@ -128,7 +138,8 @@ export async function fetchUniqueDimensionValues(dimension: string): Promise<str
       throw new Error("Invalid data format for unique dimension values received from API.");
     }
     
-    return result.data as string[];
+    // `total` counts every matching value, not just this page
+    return { values: result.data as string[], total: typeof result.total === "number" ? result.total : result.data.length };
   } catch (err) {
     console.error(`Error fetching unique values for dimension ${dimension}:`, err);
     throw new Error(`Failed to fetch unique dimension values: ${err instanceof Error ? err.message : String(err)}`);
@@ -0,0 +1,232 @@
+# model_store.py
+import asyncio
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class FittedModelStore:
+    """
+    Registry of fitted time series models keyed by a hash of the series they were
+    fitted on (plus the model order). Asking for a longer or shorter horizon on an
+    unchanged series reuses the stored fit and only calls predict/forecast on it.
+
+    Fits are kept in an in-memory LRU. When cache_dir is set they are also pickled
+    to disk, so a restarted worker can serve forecasts without fitting again. The
+    directory is kept under `max_disk_bytes`: once a write goes over it, the least
+    recently used pickles (by modification time, which disk hits refresh) are removed
+    until it is back under 90% of the limit.
+
+    get_async()/put_async() serve memory hits on the caller's thread and do the disk
+    reads and writes (pickling, replacing and pruning files) in a worker thread, so an
+    event loop isn't blocked by them.
+
+    Each in-memory fit also records how many incremental updates (appended months
+    or warm-started refits) it is away from its last full fit, so callers can force
+    a full refit every so often. Fits loaded from disk count as full fits.
+    """
+
+    def __init__(self, max_entries: int = 1024, cache_dir: Optional[str] = None, max_disk_bytes: Optional[int] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.cache_dir = cache_dir or None
+        self.max_disk_bytes = int(max_disk_bytes) if max_disk_bytes else None
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._updates: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.fit_counts = {"full": 0, "warm_start": 0, "append": 0}
+        self.disk_evictions = 0
+        self._disk_bytes = 0
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    @staticmethod
+    def series_key(ts: pd.Series, order: Tuple[int, int, int]) -> str:
+        """Hashes the index, the values and the model order of a monthly series."""
+        digest = hashlib.sha1()
+        digest.update(repr(tuple(order)).encode())
+        digest.update(np.asarray(ts.index.asi8 if isinstance(ts.index, pd.DatetimeIndex) else ts.index, dtype='int64').tobytes())
+        digest.update(np.ascontiguousarray(ts.to_numpy(dtype='float64')).tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _get_from_memory(self, key: str) -> Optional[Any]:
+        with self._lock:
+            model_fit = self._entries.get(key)
+            if model_fit is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return model_fit
+
+    def get(self, key: str) -> Optional[Any]:
+        model_fit = self._get_from_memory(key)
+        if model_fit is not None:
+            return model_fit
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as f:
+                    model_fit = pickle.load(f)
+                os.utime(self._path(key)) # most recently used for the disk LRU
+            except FileNotFoundError:
+                model_fit = None # pruned meanwhile (possibly by another worker)
+            except Exception as e:
+                print(f"Warning: Could not load stored model {key} from disk: {e}")
+                model_fit = None
+            if model_fit is not None:
+                self._remember(key, model_fit)
+                with self._lock:
+                    self.disk_hits += 1
+                return model_fit
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() with the disk lookup run in a worker thread."""
+        model_fit = self._get_from_memory(key)
+        if model_fit is not None:
+            return model_fit
+        if self.cache_dir:
+            return await asyncio.to_thread(self.get, key)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def find_prefix_fit(self, ts: pd.Series, order: Tuple[int, int, int], max_new_points: int) -> Optional[Tuple[Any, int, int]]:
+        """
+        Looks for an in-memory fit on the same series without its last 1..max_new_points
+        values, i.e. the series as it was before the latest months closed. Returns
+        (model_fit, number of new points, updates since its last full fit) or None.
+        """
+        for n_new in range(1, min(max_new_points, len(ts) - 1) + 1):
+            key = self.series_key(ts.iloc[:-n_new], order)
+            with self._lock:
+                model_fit = self._entries.get(key)
+                if model_fit is not None:
+                    self._entries.move_to_end(key)
+                    return model_fit, n_new, self._updates.get(key, 0)
+        return None
+
+    def record_fit(self, kind: str) -> None:
+        with self._lock:
+            self.fit_counts[kind] = self.fit_counts.get(kind, 0) + 1
+
+    def put(self, key: str, model_fit: Any, updates_since_full_fit: int = 0) -> None:
+        self._put_in_memory(key, model_fit, updates_since_full_fit)
+        if self.cache_dir:
+            self._write_to_disk(key, model_fit)
+
+    async def put_async(self, key: str, model_fit: Any, updates_since_full_fit: int = 0) -> None:
+        """put() with the disk write run in a worker thread."""
+        self._put_in_memory(key, model_fit, updates_since_full_fit)
+        if self.cache_dir:
+            await asyncio.to_thread(self._write_to_disk, key, model_fit)
+
+    def _put_in_memory(self, key: str, model_fit: Any, updates_since_full_fit: int) -> None:
+        self._remember(key, model_fit)
+        with self._lock:
+            if key in self._entries:
+                self._updates[key] = updates_since_full_fit
+
+    def _write_to_disk(self, key: str, model_fit: Any) -> None:
+        # Write to a uniquely named temporary file first, so a concurrent reader never sees a
+        # partial pickle and concurrent writers (threads or processes) never share a file
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f"{key}.", suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(model_fit, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            try:
+                # The same key written again replaces its file rather than adding one
+                size -= os.stat(self._path(key)).st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            print(f"Warning: Could not persist fitted model {key} to disk: {e}")
+            traceback.print_exc()
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._disk_bytes += size
+            over_limit = self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes
+        if over_limit:
+            self.prune_disk()
+
+    def _disk_files(self) -> List[Tuple[float, int, str]]:
+        """(modification time, size, path) of every stored pickle."""
+        files = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.pkl'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def prune_disk(self) -> None:
+        """Removes the least recently used pickles until the directory is under 90% of max_disk_bytes."""
+        if not self.cache_dir or self.max_disk_bytes is None:
+            return
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        removed = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+            self.disk_evictions += removed
+
+    def _remember(self, key: str, model_fit: Any) -> None:
+        with self._lock:
+            self._entries[key] = model_fit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._updates.pop(evicted_key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "fits": dict(self.fit_counts),
+                "persisted": bool(self.cache_dir),
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "disk_evictions": self.disk_evictions,
+            }
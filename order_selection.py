@@ -0,0 +1,164 @@
+# order_selection.py
+import json
+import os
+import tempfile
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from model_store import FittedModelStore
+
+
+# Order used until a series has a selected one (and whenever selection is disabled)
+DEFAULT_ARIMA_ORDER = (1, 1, 1)
+
+
+def candidate_order_levels(max_p: int, d: int, max_q: int) -> List[List[Tuple[int, int, int]]]:
+    """The (p, d, q) grid grouped by complexity p + q, simplest level first."""
+    levels: Dict[int, List[Tuple[int, int, int]]] = {}
+    for p in range(max_p + 1):
+        for q in range(max_q + 1):
+            levels.setdefault(p + q, []).append((p, d, q))
+    return [levels[k] for k in sorted(levels)]
+
+
+async def stepwise_order_search(
+    score_level: Callable[[List[Tuple[int, int, int]]], Awaitable[List[float]]],
+    candidate_levels: List[List[Tuple[int, int, int]]],
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Tuple[Optional[Tuple[int, int, int]], float, int]:
+    """
+    Stepwise order search: the levels of `candidate_levels` are scored in turn, each
+    with one `score_level(level)` call (so the caller can score a level's orders
+    concurrently), stopping at the first level that doesn't improve on the best score
+    so far, or when `should_stop()` says so. Returns (best order or None, its score,
+    number of fits).
+    """
+    best_order, best_score, fits = None, float('inf'), 0
+    for level in candidate_levels:
+        if should_stop is not None and should_stop():
+            break
+        level_scores = list(zip(await score_level(level), level))
+        fits += len(level)
+        level_score, level_order = min(level_scores, key=lambda item: item[0])
+        if level_score < best_score:
+            best_order, best_score = level_order, level_score
+        elif best_order is not None:
+            break
+    return best_order, best_score, fits
+
+
+class ArimaOrderStore:
+    """
+    Selected ARIMA order (and its score) per monthly series, keyed by a hash of the
+    series like the fitted-model store, so an order is selected once per version of
+    the data. When a series only gained new months, the order selected for its
+    previous version is reused instead of searching again.
+
+    Entries are kept in an LRU and, when `path` is set, written to a JSON file so a
+    restarted worker keeps its selections. put() only marks the store dirty; the
+    owner calls save() (off the event loop, batching several puts).
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.path = path or None
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    for key, entry in json.load(f).items():
+                        self._entries[key] = entry
+            except Exception as e:
+                print(f"Warning: Could not read stored ARIMA orders from {self.path}: {e}")
+
+    @staticmethod
+    def series_key(ts: pd.Series) -> str:
+        # No order: the key identifies the series itself
+        return FittedModelStore.series_key(ts, ())
+
+    def lookup(self, ts: pd.Series, max_new_points: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        The entry for `ts`, or for `ts` without its last 1..max_new_points values (which
+        is then also stored under the key of `ts`). Entries hold 'order' (a tuple),
+        'score', 'criterion' and 'points'.
+        """
+        for n_new in range(0, min(max_new_points, len(ts) - 1) + 1):
+            key = self.series_key(ts if n_new == 0 else ts.iloc[:-n_new])
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+            entry = {**entry, 'order': tuple(entry['order'])}
+            if n_new:
+                self._remember(self.series_key(ts), entry)
+            return entry
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, ts: pd.Series, order: Tuple[int, int, int], score: float, criterion: str) -> None:
+        self._remember(self.series_key(ts), {
+            'order': tuple(order),
+            'score': score,
+            'criterion': criterion,
+            'points': len(ts),
+        })
+        with self._lock:
+            self.dirty = True
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Writes the entries to `path` if anything was put since the last save."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self.dirty:
+                return
+            entries = {key: {**entry, 'order': list(entry['order'])} for key, entry in self._entries.items()}
+            self.dirty = False
+        # Write to a uniquely named temporary file first so a concurrent reader never sees a partial file
+        tmp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=directory, prefix=f"{os.path.basename(self.path)}.",
+                                             suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Warning: Could not persist ARIMA orders to {self.path}: {e}")
+            traceback.print_exc()
+            with self._lock:
+                self.dirty = True
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "persisted": bool(self.path),
+            }
@@ -0,0 +1,277 @@
+# sales_cube.py
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from column_index import ColumnIndex
+
+
+# Columns that are never used as cube dimensions
+NON_DIMENSION_COLUMNS = {'id', 'date', 'month', 'category', 'sales_person', 'revenue', 'actual'}
+
+
+def _month_ordinals(dates: pd.Series) -> np.ndarray:
+    return (dates.dt.year.to_numpy(dtype='int32') * 12 + dates.dt.month.to_numpy(dtype='int32') - 1)
+
+
+def detect_dimension_columns(sales_df: pd.DataFrame, max_cardinality: int) -> List[str]:
+    """
+    Picks the text columns with at most `max_cardinality` distinct values as cube dimensions.
+    Columns holding unhashable values (jsonb objects or arrays read as dicts and lists) are skipped.
+    """
+    dimensions = []
+    for col in sales_df.columns:
+        if col in NON_DIMENSION_COLUMNS:
+            continue
+        if pd.api.types.is_numeric_dtype(sales_df[col]) or pd.api.types.is_datetime64_any_dtype(sales_df[col]):
+            continue
+        try:
+            n_values = sales_df[col].nunique(dropna=True)
+        except TypeError:
+            continue
+        if n_values <= max_cardinality:
+            dimensions.append(col)
+    return dimensions
+
+
+class MonthlyCube:
+    """
+    Revenue summed by month x category x sales_person x a set of dimension columns,
+    built once per data load. Every key is stored as an integer code array, so a
+    request slices a series by comparing a few small integer arrays instead of
+    lower-casing and scanning every raw transaction.
+
+    Sales person and dimension codes are assigned to the lower-cased values, which
+    matches how generate_forecast_data compares filters.
+    """
+
+    def __init__(
+        self,
+        first_month: int,
+        n_months: int,
+        month: np.ndarray,
+        category: np.ndarray,
+        categories: np.ndarray,
+        revenue: np.ndarray,
+        row_count: np.ndarray,
+        sales_person: Optional[np.ndarray],
+        sales_person_codes: Dict[str, int],
+        dimensions: Dict[str, np.ndarray],
+        dimension_codes: Dict[str, Dict[str, int]],
+        build_seconds: float = 0.0,
+    ):
+        self.first_month = first_month
+        self.n_months = n_months
+        self.month = month
+        self.category = category
+        self.categories = categories
+        self.revenue = revenue
+        self.row_count = row_count
+        self.sales_person = sales_person
+        self.sales_person_codes = sales_person_codes
+        self.dimensions = dimensions
+        self.dimension_codes = dimension_codes
+        self.build_seconds = build_seconds
+
+    @classmethod
+    def build(
+        cls,
+        sales_df: pd.DataFrame,
+        dimension_columns: Sequence[str],
+        indexes: Optional[Dict[str, "ColumnIndex"]] = None,
+    ) -> Optional["MonthlyCube"]:
+        """
+        Aggregates a normalized sales frame; returns None when it has no 'date' or
+        'revenue' column. Columns with a ColumnIndex reuse its normalized codes.
+        """
+        if sales_df.empty or 'date' not in sales_df.columns or 'revenue' not in sales_df.columns:
+            return None
+
+        start = time.perf_counter()
+        months = _month_ordinals(sales_df['date'])
+        first_month = int(months.min())
+        keys = {
+            'month': (months - first_month).astype('int32'),
+        }
+        category_codes, categories = pd.factorize(sales_df['category'], sort=True)
+        keys['category'] = category_codes.astype('int32')
+
+        indexes = indexes or {}
+
+        def lowered_codes(column: str):
+            if column in indexes:
+                return indexes[column].codes, indexes[column].lookup
+            codes, uniques = pd.factorize(sales_df[column].astype(str).str.lower().where(sales_df[column].notna()))
+            return codes.astype('int32'), {value: code for code, value in enumerate(uniques)}
+
+        sales_person_codes: Dict[str, int] = {}
+        if 'sales_person' in sales_df.columns:
+            keys['sales_person'], sales_person_codes = lowered_codes('sales_person')
+
+        dimension_codes: Dict[str, Dict[str, int]] = {}
+        for col in dimension_columns:
+            if col in sales_df.columns and col not in keys:
+                keys[f"dim:{col}"], dimension_codes[col] = lowered_codes(col)
+
+        revenue = pd.to_numeric(sales_df['revenue'], errors='coerce').fillna(0).to_numpy(dtype='float64')
+        grouped = (
+            pd.DataFrame({**keys, 'revenue': revenue, 'rows': np.ones(len(revenue), dtype='int32')})
+            .groupby(list(keys), sort=False)
+            .sum()
+            .reset_index()
+        )
+        # Rows without a category (code -1) never reach a category groupby
+        grouped = grouped[grouped['category'] >= 0]
+
+        def column(name: str, dtype: str) -> np.ndarray:
+            return grouped[name].to_numpy(dtype=dtype)
+
+        return cls(
+            first_month=first_month,
+            n_months=int(months.max()) - first_month + 1,
+            month=column('month', 'int32'),
+            category=column('category', 'int32'),
+            categories=np.asarray(categories, dtype=object),
+            revenue=column('revenue', 'float64'),
+            row_count=column('rows', 'int32'),
+            sales_person=column('sales_person', 'int32') if 'sales_person' in keys else None,
+            sales_person_codes=sales_person_codes,
+            dimensions={col: column(f"dim:{col}", 'int32') for col in dimension_codes},
+            dimension_codes=dimension_codes,
+            build_seconds=time.perf_counter() - start,
+        )
+
+    def __len__(self) -> int:
+        return len(self.revenue)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.month, self.category, self.revenue, self.row_count, *self.dimensions.values()]
+        if self.sales_person is not None:
+            arrays.append(self.sales_person)
+        return int(sum(a.nbytes for a in arrays))
+
+    def supports(self, dimension_col: Optional[str]) -> bool:
+        return dimension_col is None or dimension_col in self.dimensions
+
+    def _sales_person_mask(self, sales_person: Optional[str]) -> Optional[np.ndarray]:
+        """Cells of the sales person (all cells without a filter); None when they have no rows."""
+        mask = np.ones(len(self.revenue), dtype=bool)
+        if sales_person and self.sales_person is not None:
+            code = self.sales_person_codes.get(str(sales_person).lower())
+            if code is None:
+                return None
+            mask &= self.sales_person == code
+        return mask
+
+    def _series_by_group(self, mask: np.ndarray, groups: np.ndarray, n_groups: int) -> List[Dict[str, pd.Series]]:
+        """
+        Sums the masked cells per (group, category, month) and cuts each (group, category)
+        run into a monthly series. Only the keys of non-empty cells are sorted, so memory
+        stays proportional to the cells rather than to groups x categories x months.
+        """
+        n_categories = len(self.categories)
+        flat = (groups[mask].astype('int64') * n_categories + self.category[mask]) * self.n_months + self.month[mask]
+        keys, inverse = np.unique(flat, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        totals = np.bincount(inverse, weights=self.revenue[mask], minlength=len(keys))
+        counts = np.bincount(inverse, weights=self.row_count[mask], minlength=len(keys))
+        series_keys, months = np.divmod(keys, self.n_months)
+
+        first_month = pd.Timestamp(year=self.first_month // 12, month=self.first_month % 12 + 1, day=1)
+        month_index = pd.date_range(start=first_month, periods=self.n_months, freq='MS')
+        result: List[Dict[str, pd.Series]] = [{} for _ in range(n_groups)]
+        # Keys are sorted, so each (group, category) is a contiguous run ordered by month
+        boundaries = np.flatnonzero(np.diff(series_keys)) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(keys)]):
+            run_months = months[start:end]
+            present = run_months[counts[start:end] != 0]
+            if len(present) == 0:
+                continue
+            lo, hi = present[0], present[-1]
+            within = (run_months >= lo) & (run_months <= hi)
+            values = np.zeros(hi - lo + 1)
+            values[run_months[within] - lo] = totals[start:end][within]
+            group, category_code = divmod(int(series_keys[start]), n_categories)
+            result[group][self.categories[category_code]] = pd.Series(values, index=month_index[lo:hi + 1])
+        return result
+
+    def category_series(
+        self,
+        sales_person: Optional[str] = None,
+        dimension_col: Optional[str] = None,
+        dimension_value: Optional[str] = None,
+    ) -> Dict[str, pd.Series]:
+        """
+        Returns {category: monthly revenue series} for the cells matching the filters.
+        Each series runs from the category's first to its last month with any rows,
+        with empty months in between set to 0 - the same shape resample('MS').sum()
+        gives on the raw rows. `dimension_col` must be one the cube was built with.
+        """
+        mask = self._sales_person_mask(sales_person)
+        if mask is None:
+            return {}
+        if dimension_col and dimension_value:
+            code = self.dimension_codes[dimension_col].get(dimension_value.lower())
+            if code is None:
+                return {}
+            mask &= self.dimensions[dimension_col] == code
+        if not mask.any():
+            return {}
+        return self._series_by_group(mask, np.zeros(len(self.revenue), dtype='int32'), 1)[0]
+
+    def category_series_by_groups(self, dimension_cols: Sequence[str] = ()) -> Tuple[np.ndarray, List[Dict[str, pd.Series]]]:
+        """
+        Splits the whole cube by sales person and `dimension_cols` (which must be cube
+        dimensions): returns an (n_groups x (1 + len(dimension_cols))) array of the groups'
+        sales person and dimension codes (-1 for missing values, and for every group when
+        there is no sales person column) and each group's {category: monthly series}.
+        """
+        n_cells = len(self.revenue)
+        sales_person = self.sales_person if self.sales_person is not None else np.full(n_cells, -1, dtype='int32')
+        columns = np.stack([sales_person, *(self.dimensions[col] for col in dimension_cols)], axis=1)
+        if n_cells == 0:
+            return columns, []
+        keys, groups = np.unique(columns, axis=0, return_inverse=True)
+        return keys, self._series_by_group(np.ones(n_cells, dtype=bool), groups.reshape(-1).astype('int32'), len(keys))
+
+    def category_series_by_dimension(
+        self,
+        dimension_col: str,
+        values: Optional[List[str]] = None,
+        sales_person: Optional[str] = None,
+    ) -> Dict[str, Dict[str, pd.Series]]:
+        """
+        Returns {dimension value: {category: monthly series}} for several values of one
+        dimension at once (every value present when `values` is None), computed with a
+        single scatter over the cube. Values are matched ignoring case and returned as
+        given; values without rows map to {}.
+        """
+        mask = self._sales_person_mask(sales_person)
+        codes = self.dimension_codes[dimension_col]
+        if values is None:
+            values = list(codes)
+        if mask is None:
+            return {value: {} for value in values}
+
+        # Map the requested dimension codes to groups 0..k-1; every other code to -1
+        group_of_code = np.full(len(codes) + 1, -1, dtype='int32')
+        wanted = []
+        for value in values:
+            code = codes.get(value.lower())
+            if code is not None and group_of_code[code] < 0:
+                group_of_code[code] = len(wanted)
+                wanted.append(code)
+        groups = group_of_code[self.dimensions[dimension_col]]
+        mask &= groups >= 0
+        if not wanted or not mask.any():
+            return {value: {} for value in values}
+
+        series_by_group = self._series_by_group(mask, groups, len(wanted))
+        return {
+            value: series_by_group[group_of_code[codes[value.lower()]]] if value.lower() in codes else {}
+            for value in values
+        }
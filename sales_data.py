@@ -0,0 +1,278 @@
+# sales_data.py
+import asyncio
+import math
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from instrumentation import DEBUG_LOGGING, span
+from supabase_async import SupabaseApiError
+
+
+# --- UPDATED: Added 'txdate' and 'journey_dt' to common date column names ---
+DATE_COLUMNS_TO_CHECK = ['date', 'saledate', 'transaction_date', 'order_date', 'txdate', 'journey_dt']
+
+
+def normalize_sales_frame(data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Turns raw 'sales_raw_data' rows into the frame the forecasting code expects:
+    snake_case column names, a datetime 'date' column plus 'month', a string
+    'category' (defaulting to 'Total Sales') and a stripped 'sales_person'.
+
+    Every step works row by row, so normalizing a batch of new rows gives the
+    same result as normalizing them as part of the full table.
+    """
+    sales_df = pd.DataFrame(data)
+
+    if DEBUG_LOGGING:
+        print(f"DEBUG: Columns after initial fetch: {sales_df.columns.tolist()}")
+
+    # Convert column names to a consistent format (e.g., snake_case)
+    sales_df.columns = [col.lower().replace(' ', '_') for col in sales_df.columns]
+    if DEBUG_LOGGING:
+        print(f"DEBUG: Columns after lowercasing and snake_case conversion: {sales_df.columns.tolist()}")
+
+
+    found_date_col = None
+    for col_name in DATE_COLUMNS_TO_CHECK:
+        if col_name in sales_df.columns:
+            found_date_col = col_name
+            break
+
+    if found_date_col and found_date_col != 'date':
+        sales_df.rename(columns={found_date_col: 'date'}, inplace=True)
+        if DEBUG_LOGGING:
+            print(f"DEBUG: Renamed '{found_date_col}' to 'date'. Current columns: {sales_df.columns.tolist()}")
+    elif not found_date_col:
+        print(f"Warning: No common date column found in {sales_df.columns.tolist()} (checked {DATE_COLUMNS_TO_CHECK}). Forecasting may fail.")
+
+
+    # Convert 'date' column to datetime objects
+    if 'date' in sales_df.columns:
+        try:
+            # --- CRITICAL FIX: Use format='mixed' to handle various date formats ---
+            sales_df['date'] = pd.to_datetime(sales_df['date'], format='mixed', errors='coerce')
+            # Drop rows where date conversion failed (if any)
+            sales_df.dropna(subset=['date'], inplace=True)
+
+            # Extract month for grouping/display
+            sales_df['month'] = sales_df['date'].dt.strftime('%Y-%m')
+            if DEBUG_LOGGING:
+                print(f"DEBUG: 'date' column successfully converted to datetime and 'month' column created.")
+                print(f"DEBUG: Date column info after conversion:\n{sales_df['date'].info()}")
+                print(f"DEBUG: Sample dates:\n{sales_df['date'].head()}")
+
+        except Exception as e:
+            print(f"Error converting 'date' column to datetime: {e}. 'date' column type: {sales_df['date'].dtype}")
+            # If conversion fails, drop the 'date' column to prevent further errors or handle as needed
+            sales_df.drop(columns=['date'], errors='ignore', inplace=True)
+            print("Warning: 'date' column conversion failed and was dropped. Forecasting will likely fail.")
+    else:
+        print("Warning: 'date' column not found in sales_raw_data after all processing. Forecasting will likely fail.")
+
+    # --- UPDATED: Handle 'category' column ---
+    if 'category' in sales_df.columns:
+        sales_df['category'] = sales_df['category'].astype(str)
+        if DEBUG_LOGGING:
+            print("DEBUG: 'category' column found and processed.")
+    else:
+        # If 'category' column is not found, create a default one
+        sales_df['category'] = "Total Sales"
+        print("Warning: 'category' column not found in sales_raw_data. A 'Total Sales' category was created.")
+        if DEBUG_LOGGING:
+            print(f"DEBUG: 'category' column assigned as 'Total Sales'.")
+
+
+    # Ensure 'sales_person' column exists and is string type for filtering
+    if 'sales_person' in sales_df.columns:
+        sales_df['sales_person'] = sales_df['sales_person'].astype(str).str.strip()
+        if DEBUG_LOGGING:
+            print(f"DEBUG: 'sales_person' column processed. Sample:\n{sales_df['sales_person'].head()}")
+    else:
+        print("Warning: 'sales_person' column not found in data, Sales person filtering will be skipped.")
+
+    return sales_df
+
+
+# (last id, last `updated_column` value) seen by a load
+HighWaterMark = Tuple[Optional[Any], Optional[Any]]
+
+
+def _normalized_name(column: str) -> str:
+    return column.lower().replace(' ', '_')
+
+
+class IncrementalSalesLoader:
+    """
+    Loads 'sales_raw_data' in pages and, after the first load, only fetches rows
+    past a high-water mark.
+
+    Pages are read with keyset pagination on the unique, increasing `id_column`
+    (`id > last_seen ORDER BY id LIMIT page_size`), so no page costs an OFFSET
+    scan. The high-water mark is the largest id seen, or the largest
+    `updated_column` value when one is configured; in that mode changed rows
+    replace their previous version in the frame. Deleted rows are only
+    picked up by a full reload (`reset()`).
+
+    A load doesn't move the high-water mark itself: it returns the mark its rows
+    reach, and the caller commits it with commit_high_water_mark() once the merged
+    frame is in use. A load whose result is thrown away (e.g. the snapshot build
+    failed) is then simply fetched again.
+
+    load_async() takes an AsyncSupabaseClient (supabase_async.py) and, after the
+    first page, splits the remaining id range into shards that are paged
+    concurrently, with at most `concurrency` requests in flight.
+
+    The client is passed to each call rather than held, so a stub client
+    (see supabase_stub.py) can be swapped in for local runs.
+    """
+
+    def __init__(
+        self,
+        table: str = 'sales_raw_data',
+        id_column: str = 'id',
+        updated_column: Optional[str] = None,
+        page_size: int = 1000,
+        concurrency: int = 4,
+    ):
+        self.table = table
+        self.id_column = id_column
+        self.updated_column = updated_column
+        self.page_size = max(1, int(page_size))
+        self.concurrency = max(1, int(concurrency))
+        self.last_id: Optional[Any] = None
+        self.last_updated: Optional[Any] = None
+        self.supports_incremental = True
+
+    @property
+    def has_high_water_mark(self) -> bool:
+        return self.last_id is not None
+
+    @property
+    def high_water_mark(self) -> HighWaterMark:
+        return self.last_id, self.last_updated
+
+    def commit_high_water_mark(self, mark: HighWaterMark) -> None:
+        """Moves the high-water mark to one returned by load_async()."""
+        self.last_id, self.last_updated = mark
+
+    def reset(self) -> None:
+        """Forgets the high-water mark so the next load fetches the whole table again."""
+        self.last_id = None
+        self.last_updated = None
+        self.supports_incremental = True
+
+    async def _fetch_rows_async(self, client) -> List[Dict[str, Any]]:
+        """
+        Fetches every row past the high-water mark. After the first keyset page, the
+        ids up to the largest remaining one are split into about one shard per page (by
+        the remaining row count) and each shard is keyset-paged on its own, all shards
+        concurrently. Ids that aren't integers are paged as a single shard.
+        """
+        if not self.supports_incremental:
+            return await client.select(self.table)
+
+        filters = []
+        if self.updated_column is not None and self.last_updated is not None:
+            filters.append((self.updated_column, 'gt', self.last_updated))
+        elif self.last_id is not None:
+            filters.append((self.id_column, 'gt', self.last_id))
+        try:
+            first_page = await client.select(self.table, filters=filters, order=self.id_column, limit=self.page_size)
+        except SupabaseApiError as e:
+            if not e.is_undefined_column:
+                raise
+            # Ordering by a missing column fails; treat it like a table without ids
+            print(f"Warning: Keyset query on '{self.id_column}' failed ({e}).")
+            first_page = [{}]
+        if not first_page:
+            return []
+        if self.id_column not in first_page[0]:
+            print(f"Warning: Column '{self.id_column}' not found in {self.table}, incremental loading disabled.")
+            self.supports_incremental = False
+            return await client.select(self.table)
+        if len(first_page) < self.page_size:
+            return first_page
+
+        cursor = first_page[-1][self.id_column]
+        remaining_filters = filters + [(self.id_column, 'gt', cursor)]
+        last_row = await client.select(
+            self.table, columns=self.id_column, filters=remaining_filters, order=self.id_column, descending=True, limit=1
+        )
+        if not last_row:
+            return first_page
+        last_id = last_row[0][self.id_column]
+
+        bounds = [cursor, last_id]
+        integer_ids = all(isinstance(v, int) and not isinstance(v, bool) for v in (cursor, last_id))
+        if self.concurrency > 1 and integer_ids:
+            remaining = await client.count(self.table, remaining_filters)
+            # Shards sized for 3/4 of a page, so uneven ids rarely spill a shard into a second request
+            n_shards = max(1, min(math.ceil(remaining / max(1, self.page_size * 3 // 4)), last_id - cursor))
+            bounds = [cursor + (last_id - cursor) * i // n_shards for i in range(n_shards + 1)]
+
+        in_flight = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_shard(after: Any, through: Any) -> List[Dict[str, Any]]:
+            rows: List[Dict[str, Any]] = []
+            while True:
+                shard_filters = filters + [(self.id_column, 'gt', after), (self.id_column, 'lte', through)]
+                async with in_flight:
+                    page = await client.select(self.table, filters=shard_filters, order=self.id_column, limit=self.page_size)
+                rows.extend(page)
+                if len(page) < self.page_size:
+                    return rows
+                after = page[-1][self.id_column]
+
+        shards = await asyncio.gather(*(fetch_shard(lo, hi) for lo, hi in zip(bounds, bounds[1:])))
+        return first_page + [row for shard in shards for row in shard]
+
+    def _high_water_mark_after(self, rows: List[Dict[str, Any]]) -> HighWaterMark:
+        last_id, last_updated = self.high_water_mark
+        ids = [row[self.id_column] for row in rows if row.get(self.id_column) is not None]
+        if ids:
+            last_id = max(ids + ([last_id] if last_id is not None else []))
+        if self.updated_column:
+            updates = [row[self.updated_column] for row in rows if row.get(self.updated_column) is not None]
+            if updates:
+                last_updated = max(updates + ([last_updated] if last_updated is not None else []))
+        return last_id, last_updated
+
+    async def load_async(self, client, current: pd.DataFrame) -> Tuple[pd.DataFrame, int, HighWaterMark]:
+        """
+        Fetches rows past the high-water mark and merges them into `current`.
+        Returns the resulting frame, the number of fetched rows and the high-water
+        mark to commit once the frame is in use; when nothing new was found,
+        `current` itself is returned unchanged.
+
+        Normalizing and merging the fetched rows run in a worker thread, so the
+        event loop keeps serving requests meanwhile.
+        """
+        full_load = not self.has_high_water_mark or not self.supports_incremental
+        try:
+            with span('fetch'):
+                rows = await self._fetch_rows_async(client)
+        except Exception:
+            traceback.print_exc()
+            raise
+        return await asyncio.to_thread(self._merge, rows, current, full_load or not self.supports_incremental)
+
+    def _merge(self, rows: List[Dict[str, Any]], current: pd.DataFrame, full_load: bool) -> Tuple[pd.DataFrame, int, HighWaterMark]:
+        if not rows:
+            return (pd.DataFrame() if full_load else current), 0, self.high_water_mark
+
+        with span('normalize'):
+            delta_df = normalize_sales_frame(rows)
+        mark = self._high_water_mark_after(rows)
+
+        if full_load or current.empty:
+            return delta_df.reset_index(drop=True), len(rows), mark
+
+        id_col = _normalized_name(self.id_column)
+        if self.updated_column and id_col in current.columns and id_col in delta_df.columns:
+            # Changed rows replace their previous version
+            current = current[~current[id_col].isin(delta_df[id_col])]
+        if DEBUG_LOGGING:
+            print(f"DEBUG: Appending {len(delta_df)} new or changed rows to {len(current)} in-memory rows.")
+        return pd.concat([current, delta_df], ignore_index=True), len(rows), mark
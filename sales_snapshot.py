@@ -0,0 +1,69 @@
+# sales_snapshot.py
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from column_index import ColumnIndex, build_column_indexes, encode_categorical_columns
+from dimension_catalogue import DimensionCatalogue
+from instrumentation import DEBUG_LOGGING
+from sales_cube import MonthlyCube
+
+
+@dataclass(frozen=True)
+class SalesSnapshot:
+    """
+    One immutable version of the loaded sales data together with everything derived
+    from it (column indexes, monthly cube, dimension catalogue). A reload builds a new snapshot and swaps
+    the module-level reference in a single assignment, so a request that grabbed
+    the previous snapshot keeps reading consistent data until it finishes.
+
+    Requests must treat `frame` as read-only: they work on row positions from the
+    indexes or on `frame.iloc[...]` subsets and never copy or modify the full frame.
+    All per-row preparation (categorical encoding, numeric 'revenue') happens once
+    in build().
+    """
+
+    frame: pd.DataFrame
+    version: int
+    indexes: Dict[str, ColumnIndex] = field(default_factory=dict)
+    cube: Optional[MonthlyCube] = None
+    catalogue: Optional[DimensionCatalogue] = None
+
+    @classmethod
+    def build(cls, sales_df: pd.DataFrame, version: int, dimension_columns: Sequence[str]) -> "SalesSnapshot":
+        if sales_df.empty:
+            return cls(frame=sales_df, version=version)
+
+        encode_categorical_columns(sales_df, ['category', 'sales_person', *dimension_columns])
+        if 'revenue' in sales_df.columns:
+            sales_df['revenue'] = pd.to_numeric(sales_df['revenue'], errors='coerce').fillna(0)
+        indexes = build_column_indexes(sales_df)
+
+        cube = None
+        try:
+            cube = MonthlyCube.build(sales_df, dimension_columns, indexes)
+            if cube is not None:
+                if DEBUG_LOGGING:
+                    print(f"DEBUG: Built monthly cube with {len(cube)} cells ({cube.nbytes} bytes) over dimensions {list(cube.dimensions)} in {cube.build_seconds:.3f}s")
+        except Exception as e:
+            print(f"Warning: Could not build the monthly cube, forecasts will scan raw rows: {e}")
+
+        # Every column is catalogued here, off the event loop, so requests never build an entry
+        catalogue = DimensionCatalogue(sales_df, indexes)
+        return cls(frame=sales_df, version=version, indexes=indexes, cube=cube, catalogue=catalogue)
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def filter_positions(self, column: str, value: str) -> np.ndarray:
+        """Sorted row positions whose `column` equals `value`, ignoring case."""
+        column_index = self.indexes.get(column)
+        if column_index is not None:
+            return column_index.positions(value)
+        return np.flatnonzero((self.frame[column].astype(str).str.lower() == str(value).lower()).to_numpy())
@@ -0,0 +1,108 @@
+# snapshot_store.py
+import json
+import os
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from instrumentation import DEBUG_LOGGING
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError: # pyarrow is optional; without it snapshots are simply disabled
+    pa = None
+    pa_ipc = None
+
+
+# Bump when the layout of the normalized frame changes so old snapshots are ignored
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_DATA_FILE = 'sales_raw_data.arrow'
+SNAPSHOT_META_FILE = 'sales_raw_data.meta.json'
+
+
+def snapshots_available() -> bool:
+    return pa is not None
+
+
+def save_snapshot(sales_df: pd.DataFrame, snapshot_dir: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Writes the normalized sales frame as an uncompressed Arrow IPC file (so it can be
+    memory-mapped on load) next to a JSON sidecar holding the schema and version
+    metadata. Both files are written to temporary names and swapped in, so a crash
+    mid-write never leaves a half-written snapshot behind.
+    """
+    if pa is None:
+        print("Warning: pyarrow is not installed, skipping sales data snapshot.")
+        return False
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    data_path = os.path.join(snapshot_dir, SNAPSHOT_DATA_FILE)
+    meta_path = os.path.join(snapshot_dir, SNAPSHOT_META_FILE)
+    tmp_suffix = f".{os.getpid()}.tmp"
+    try:
+        start = time.perf_counter()
+        table = pa.Table.from_pandas(sales_df, preserve_index=False)
+        with pa.OSFile(data_path + tmp_suffix, 'wb') as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        meta = {
+            **(metadata or {}),
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "rows": len(sales_df),
+            "columns": {col: str(dtype) for col, dtype in sales_df.dtypes.items()},
+            "written_at": datetime.now().isoformat(),
+        }
+        with open(meta_path + tmp_suffix, 'w') as f:
+            json.dump(meta, f, default=str)
+
+        os.replace(data_path + tmp_suffix, data_path)
+        os.replace(meta_path + tmp_suffix, meta_path)
+        if DEBUG_LOGGING:
+            print(f"DEBUG: Wrote sales data snapshot ({len(sales_df)} rows) to {snapshot_dir} in {time.perf_counter() - start:.3f}s")
+        return True
+    except Exception as e:
+        print(f"Warning: Could not write sales data snapshot to {snapshot_dir}: {e}")
+        traceback.print_exc()
+        for path in (data_path + tmp_suffix, meta_path + tmp_suffix):
+            if os.path.exists(path):
+                os.remove(path)
+        return False
+
+
+def load_snapshot(snapshot_dir: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+    """
+    Memory-maps a snapshot written by save_snapshot and returns (frame, metadata),
+    or None when there is no usable snapshot (missing, older format, or unreadable).
+    """
+    if pa is None:
+        return None
+
+    data_path = os.path.join(snapshot_dir, SNAPSHOT_DATA_FILE)
+    meta_path = os.path.join(snapshot_dir, SNAPSHOT_META_FILE)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            print(f"Warning: Ignoring sales data snapshot with format version {meta.get('format_version')} (expected {SNAPSHOT_FORMAT_VERSION}).")
+            return None
+
+        start = time.perf_counter()
+        source = pa.memory_map(data_path, 'r')
+        table = pa_ipc.open_file(source).read_all()
+        # Numeric and datetime columns without nulls are backed by the mapped pages directly
+        sales_df = table.to_pandas(split_blocks=True, self_destruct=True)
+        if DEBUG_LOGGING:
+            print(f"DEBUG: Loaded sales data snapshot ({len(sales_df)} rows) from {snapshot_dir} in {time.perf_counter() - start:.3f}s")
+        return sales_df, meta
+    except Exception as e:
+        print(f"Warning: Could not load sales data snapshot from {snapshot_dir}: {e}")
+        traceback.print_exc()
+        return None
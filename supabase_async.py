@@ -0,0 +1,204 @@
+# supabase_async.py
+import asyncio
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+
+# (column, operator, value) with a PostgREST operator such as 'eq', 'gt', 'gte' or 'lt'
+Filter = Tuple[str, str, Any]
+
+# Statuses worth retrying: rate limiting and transient gateway/server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Postgres error code PostgREST passes on when a query names a column the table doesn't have
+UNDEFINED_COLUMN = "42703"
+
+
+class SupabaseApiError(Exception):
+    """
+    A non-retryable (or still failing after the retries) answer from the Supabase REST or Auth API.
+    `code` is the PostgREST/Postgres error code from the response body, when it has one.
+    """
+
+    def __init__(self, status: int, message: str, code: Optional[str] = None):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+        self.code = code
+
+    @property
+    def is_undefined_column(self) -> bool:
+        return self.status == 400 and self.code == UNDEFINED_COLUMN
+
+
+def _format_filter_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text or response.reason_phrase
+    if isinstance(body, dict):
+        for key in ("message", "msg", "error_description", "error"):
+            if body.get(key):
+                return str(body[key])
+    return str(body)
+
+
+def _error_code(response: httpx.Response) -> Optional[str]:
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict) and body.get("code"):
+        return str(body["code"])
+    return None
+
+
+class AsyncSupabaseClient:
+    """
+    Non-blocking access to the Supabase REST (PostgREST) and Auth endpoints the backend
+    uses, over one pooled httpx.AsyncClient, so a round trip never holds up the event
+    loop or a worker thread.
+
+    Idempotent reads are retried on connection errors, timeouts, 429 and 5xx answers
+    with exponential backoff plus jitter (honouring Retry-After), `retries` times.
+
+    The pooled client is created on first use in each event loop, since its
+    connections belong to the loop that opened them; the previous loop's client
+    is closed then. aclose() closes the current one, whichever loop opened it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        max_connections: int = 20,
+        timeout_seconds: float = 30.0,
+        retries: int = 3,
+        backoff_seconds: float = 0.25,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url.rstrip('/')
+        self.key = key
+        self.max_connections = max(1, int(max_connections))
+        self.timeout_seconds = float(timeout_seconds)
+        self.retries = max(0, int(retries))
+        self.backoff_seconds = float(backoff_seconds)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: set = set()
+
+    def _http(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                task = loop.create_task(self._close_client(self._client, self._client_loop))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                headers={"apikey": self.key},
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=self.timeout_seconds,
+                transport=self._transport,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        client, client_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is not None:
+            await self._close_client(client, client_loop)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient, client_loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Closes `client` on the loop that opened it while that loop still runs, otherwise from this one."""
+        try:
+            if client_loop is not None and client_loop is not asyncio.get_running_loop() and client_loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), client_loop))
+            else:
+                await client.aclose()
+        except Exception as e:
+            print(f"Warning: Could not close the previous Supabase HTTP client: {e}")
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff_seconds * (2 ** attempt) * (1 + random.random())
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self._http().request(method, path, **kwargs)
+                if response.status_code < 400:
+                    return response
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    raise SupabaseApiError(response.status_code, _error_message(response), _error_code(response))
+                reason = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                if attempt == self.retries:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            delay = self._retry_delay(attempt, response)
+            attempt += 1
+            print(f"Warning: Supabase {method} {path} failed ({reason}), retrying in {delay:.2f}s "
+                  f"(retry {attempt} of {self.retries}).")
+            await asyncio.sleep(delay)
+
+    def _table_params(self, filters: Sequence[Filter]) -> List[Tuple[str, str]]:
+        return [(column, f"{operator}.{_format_filter_value(value)}") for column, operator, value in filters]
+
+    def _service_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.key}"}
+
+    async def select(
+        self,
+        table: str,
+        columns: str = '*',
+        filters: Sequence[Filter] = (),
+        order: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows of `table` matching all `filters`, like from_(table).select(columns).<filters>.order().limit()."""
+        params = [("select", columns), *self._table_params(filters)]
+        if order:
+            params.append(("order", f"{order}.{'desc' if descending else 'asc'}"))
+        if limit is not None:
+            params.append(("limit", str(limit)))
+        response = await self._request("GET", f"/rest/v1/{table}", params=params, headers=self._service_headers())
+        return response.json() or []
+
+    async def count(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        """Number of rows of `table` matching all `filters`, read from the Content-Range header."""
+        headers = {**self._service_headers(), "Prefer": "count=exact"}
+        params = [("select", "*"), *self._table_params(filters)]
+        response = await self._request("HEAD", f"/rest/v1/{table}", params=params, headers=headers)
+        content_range = response.headers.get("content-range", "")
+        total = content_range.rpartition('/')[2]
+        if not total.isdigit():
+            raise SupabaseApiError(response.status_code, f"No row count in Content-Range '{content_range}'")
+        return int(total)
+
+    async def get_user(self, token: str) -> Dict[str, Any]:
+        """The Supabase Auth user the access token belongs to; raises SupabaseApiError for invalid tokens."""
+        response = await self._request("GET", "/auth/v1/user", headers={"Authorization": f"Bearer {token}"})
+        return response.json()
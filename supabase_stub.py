@@ -0,0 +1,190 @@
+# supabase_stub.py
+# Minimal in-memory stand-ins for the synchronous supabase-py client and for
+# AsyncSupabaseClient, used to run the data loaders and the API locally without
+# a Supabase project.
+import asyncio
+import time
+from bisect import bisect_left, bisect_right
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from supabase_async import UNDEFINED_COLUMN, SupabaseApiError
+
+
+class _StubQuery:
+    """Implements the subset of the PostgREST query builder used by the backend."""
+
+    def __init__(self, rows: List[Dict[str, Any]], client: "StubSupabaseClient" = None):
+        self._rows = rows
+        self._client = client
+        self._filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self._lower_bounds: Dict[str, Any] = {}
+        self._upper_bounds: Dict[str, Tuple[Any, bool]] = {}
+        self._order: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._range: Optional[tuple] = None
+
+    def select(self, *columns, **kwargs) -> "_StubQuery":
+        return self
+
+    def _where(self, column: str, predicate: Callable[[Any], bool]) -> "_StubQuery":
+        self._filters.append(lambda row: row.get(column) is not None and predicate(row.get(column)))
+        return self
+
+    def eq(self, column: str, value: Any) -> "_StubQuery":
+        return self._where(column, lambda v: v == value)
+
+    def gt(self, column: str, value: Any) -> "_StubQuery":
+        self._lower_bounds[column] = value
+        return self._where(column, lambda v: v > value)
+
+    def gte(self, column: str, value: Any) -> "_StubQuery":
+        return self._where(column, lambda v: v >= value)
+
+    def lt(self, column: str, value: Any) -> "_StubQuery":
+        self._upper_bounds[column] = (value, False)
+        return self._where(column, lambda v: v < value)
+
+    def lte(self, column: str, value: Any) -> "_StubQuery":
+        self._upper_bounds[column] = (value, True)
+        return self._where(column, lambda v: v <= value)
+
+    def order(self, column: str, desc: bool = False) -> "_StubQuery":
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "_StubQuery":
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int) -> "_StubQuery":
+        self._range = (start, end)
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        if self._client is not None and self._client.latency_seconds > 0:
+            time.sleep(self._client.latency_seconds)
+        if self._client is not None and self._limit is not None and self._range is None and len(self._order) == 1:
+            column, desc = self._order[0]
+            if not desc and column in self._lower_bounds:
+                # Keyset page: seek into the rows sorted by the key instead of scanning the table
+                keys, sorted_rows = self._client._sorted_by(self._rows, column)
+                start = bisect_right(keys, self._lower_bounds[column])
+                end = len(keys)
+                if column in self._upper_bounds:
+                    bound, inclusive = self._upper_bounds[column]
+                    end = (bisect_right if inclusive else bisect_left)(keys, bound)
+                page = []
+                for row in sorted_rows[start:end]:
+                    if all(f(row) for f in self._filters):
+                        page.append(dict(row))
+                        if len(page) == self._limit:
+                            break
+                return SimpleNamespace(data=page)
+
+        rows = [row for row in self._rows if all(f(row) for f in self._filters)]
+        for column, desc in reversed(self._order):
+            rows.sort(key=lambda row: row.get(column), reverse=desc)
+        if self._range is not None:
+            rows = rows[self._range[0]:self._range[1] + 1]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return SimpleNamespace(data=[dict(row) for row in rows])
+
+
+class StubSupabaseClient:
+    """
+    Serves tables from in-memory lists of row dicts, e.g.
+    StubSupabaseClient({'sales_raw_data': rows, 'users': profiles}).
+    Rows appended to those lists are visible to later queries, which makes it
+    easy to exercise incremental loading. `latency_seconds` delays every executed
+    query to mimic network round trips.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None, latency_seconds: float = 0.0):
+        self.tables: Dict[str, List[Dict[str, Any]]] = tables if tables is not None else {}
+        self.latency_seconds = latency_seconds
+        self.queries_executed = 0
+        self._sort_cache: Dict[Tuple[int, str], Tuple[int, List[Any], List[Dict[str, Any]]]] = {}
+
+    def from_(self, table: str) -> _StubQuery:
+        self.queries_executed += 1
+        return _StubQuery(self.tables.setdefault(table, []), self)
+
+    def _sorted_by(self, rows: List[Dict[str, Any]], column: str) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """Rows with a value in `column`, sorted by it; cached until rows are added or removed."""
+        cached = self._sort_cache.get((id(rows), column))
+        if cached is None or cached[0] != len(rows):
+            sorted_rows = sorted((row for row in rows if row.get(column) is not None), key=lambda row: row[column])
+            cached = (len(rows), [row[column] for row in sorted_rows], sorted_rows)
+            self._sort_cache[(id(rows), column)] = cached
+        return cached[1], cached[2]
+
+    table = from_
+
+
+class AsyncStubSupabaseClient:
+    """
+    In-memory stand-in for AsyncSupabaseClient over the same kind of tables as
+    StubSupabaseClient. `latency_seconds` is awaited on every request, so concurrent
+    requests overlap like real round trips do; `max_in_flight` records the most
+    requests that were outstanding at once. `users` maps access tokens to the user
+    dicts get_user() returns; other tokens are rejected.
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        latency_seconds: float = 0.0,
+        users: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.sync_client = StubSupabaseClient(tables)
+        self.tables = self.sync_client.tables
+        self.latency_seconds = latency_seconds
+        self.users: Dict[str, Dict[str, Any]] = users if users is not None else {}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _round_trip(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_seconds)
+        finally:
+            self.in_flight -= 1
+
+    def _query(self, table: str, filters, order: Optional[str] = None) -> _StubQuery:
+        rows = self.tables.get(table) or []
+        for column in [column for column, _, _ in filters] + ([order] if order else []):
+            if rows and not any(column in row for row in rows):
+                # What PostgREST answers for a column the table doesn't have
+                raise SupabaseApiError(400, f"column {table}.{column} does not exist", UNDEFINED_COLUMN)
+        query = self.sync_client.from_(table).select('*')
+        for column, operator, value in filters:
+            query = getattr(query, operator)(column, value)
+        return query
+
+    async def select(self, table: str, columns: str = '*', filters=(), order: Optional[str] = None,
+                     descending: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        await self._round_trip()
+        query = self._query(table, filters, order)
+        if order:
+            query = query.order(order, desc=descending)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.execute().data
+
+    async def count(self, table: str, filters=()) -> int:
+        await self._round_trip()
+        return len(self._query(table, filters).execute().data)
+
+    async def get_user(self, token: str) -> Dict[str, Any]:
+        await self._round_trip()
+        if token not in self.users:
+            raise SupabaseApiError(401, "Invalid token")
+        return dict(self.users[token])
+
+    async def aclose(self) -> None:
+        pass
@@ -0,0 +1,113 @@
+# tests/test_forecast_records.py
+"""
+build_category_forecast_records against the per-month loop it replaced, on
+generated category series and forecasts.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+import contextlib
+import io
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from main import build_category_forecast_records
+
+
+def _loop_records(category_name, ts_for_training, forecast_series, months, current_month_start):
+    """The previous implementation: one .loc assignment per month, then an iterrows() pass."""
+    min_display_date = ts_for_training.index.min() if not ts_for_training.empty else current_month_start
+    max_display_date = forecast_series.index.max() if not forecast_series.empty else ts_for_training.index.max()
+    display_end_date_from_current = current_month_start + pd.DateOffset(months=months - 1)
+    display_end_date = max(max_display_date, display_end_date_from_current)
+
+    combined_df = pd.DataFrame(index=pd.date_range(start=min_display_date.replace(day=1),
+                                                     end=display_end_date.replace(day=1),
+                                                     freq='MS'))
+    combined_df['category'] = category_name
+    combined_df['display_actual'] = np.nan
+    combined_df['display_forecast'] = np.nan
+    combined_df['is_future'] = False
+
+    for monthly_date in combined_df.index:
+        actual_val = ts_for_training.get(monthly_date, None)
+        forecast_val = forecast_series.get(monthly_date, None)
+        is_future_for_display = monthly_date >= current_month_start
+        if is_future_for_display:
+            if pd.notna(forecast_val):
+                combined_df.loc[monthly_date, 'display_forecast'] = forecast_val
+            elif pd.notna(actual_val) and actual_val != 0.0:
+                combined_df.loc[monthly_date, 'display_actual'] = actual_val
+        else:
+            if pd.notna(actual_val):
+                combined_df.loc[monthly_date, 'display_actual'] = actual_val
+        combined_df.loc[monthly_date, 'is_future'] = is_future_for_display
+
+    records = []
+    for date_idx, row in combined_df.iterrows():
+        if pd.notna(row['display_actual']) or pd.notna(row['display_forecast']):
+            records.append({
+                "date": date_idx.strftime('%Y-%m-%d'),
+                "month": date_idx.strftime('%Y-%m'),
+                "category": category_name,
+                "actual": round(row['display_actual'], 2) if pd.notna(row['display_actual']) else None,
+                "forecast": round(row['display_forecast'], 2) if pd.notna(row['display_forecast']) else None,
+                "is_future": bool(row['is_future']),
+            })
+    return records
+
+
+def _fixture(seed):
+    """A monthly series as the cube or resample('MS').sum() gives it, and a forecast as the engines give it."""
+    rng = np.random.default_rng(seed)
+    current_month_start = datetime(2025, int(rng.integers(1, 13)), 1)
+    months = int(rng.integers(1, 19))
+
+    # Histories end before, in or after the current month (future-dated rows)
+    n_points = int(rng.integers(0, 40))
+    end = pd.Timestamp(current_month_start) + pd.DateOffset(months=int(rng.integers(-6, 4)))
+    index = pd.date_range(end=end, periods=n_points, freq='MS')
+    values = np.round(rng.uniform(0, 5000, n_points), rng.integers(0, 4))
+    values[rng.random(n_points) < 0.2] = 0.0
+    ts_for_training = pd.Series(values, index=index, dtype='float64')
+
+    forecast_dates = pd.date_range(start=current_month_start, periods=months, freq='MS')
+    kind = rng.integers(0, 4)
+    if kind == 0: # too little history, or a failed fit
+        forecast_series = pd.Series(np.nan, index=forecast_dates)
+    elif kind == 1: # partly NaN
+        forecast = rng.normal(1000, 400, months)
+        forecast[rng.random(months) < 0.3] = np.nan
+        forecast_series = pd.Series(forecast, index=forecast_dates)
+    elif kind == 2: # shorter than the requested horizon
+        forecast_series = pd.Series(rng.normal(1000, 400, months), index=forecast_dates)[:max(1, months // 2)]
+    else:
+        forecast_series = pd.Series(rng.normal(1000, 400, months), index=forecast_dates)
+    return ts_for_training, forecast_series, months, current_month_start
+
+
+@pytest.mark.parametrize("seed", range(400))
+def test_matches_the_per_month_loop(seed):
+    ts_for_training, forecast_series, months, current_month_start = _fixture(seed)
+    if ts_for_training.empty and forecast_series.empty:
+        pytest.skip("no months to display")
+    expected = _loop_records("Category", ts_for_training, forecast_series, months, current_month_start)
+    assert build_category_forecast_records("Category", ts_for_training, forecast_series, months, current_month_start) == expected
+
+
+def test_future_zero_actuals_without_forecast_are_left_out():
+    current_month_start = datetime(2025, 3, 1)
+    ts_for_training = pd.Series([10.0, 20.0, 0.0, 5.0], index=pd.date_range('2025-01-01', periods=4, freq='MS'))
+    forecast_series = pd.Series(np.nan, index=pd.date_range(current_month_start, periods=3, freq='MS'))
+
+    records = build_category_forecast_records("A", ts_for_training, forecast_series, 3, current_month_start)
+
+    assert [(r["month"], r["actual"], r["forecast"], r["is_future"]) for r in records] == [
+        ("2025-01", 10.0, None, False),
+        ("2025-02", 20.0, None, False),
+        ("2025-04", 5.0, None, True),
+    ]